@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Callable, Awaitable
+from typing import TYPE_CHECKING, Callable, Awaitable
 
-from nats.aio.msg import Msg
+if TYPE_CHECKING:
+    from nats.aio.msg import Msg
 
 
 class BaseBroker(ABC):
@@ -20,12 +21,12 @@ class BaseBroker(ABC):
         pass
 
     @abstractmethod
-    def publish(self, subject: None | str, message: None | bytes | dict) -> None:
+    def publish(self, subject: None | str, message: None | bytes | dict, headers: None | dict = None) -> None:
         """Publish a message to the broker."""
         pass
 
     @abstractmethod
-    def subscribe(self, subject: None | str, handler: Callable[[Msg], Awaitable[None]] | None) -> None:
+    def subscribe(self, subject: None | str, handler: Callable[["Msg"], Awaitable[None]] | None) -> None:
         """Subscribe to a broker topic with a message handler."""
         pass
 
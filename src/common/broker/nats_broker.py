@@ -65,7 +65,7 @@ class NATSBroker(BaseBroker):
             except Exception as e:
                 logger.warning(f"Error while closing NATS connection: {e}")
 
-    async def publish(self, subject: str, message: dict | bytes | BaseModel) -> None:
+    async def publish(self, subject: str, message: dict | bytes | BaseModel, headers: dict | None = None) -> None:
         """Publish a message to a NATS subject."""
 
         if not self.client or not self.client.is_connected:
@@ -82,7 +82,7 @@ class NATSBroker(BaseBroker):
                 logger.error("Message could not published.")
                 raise TypeError("Message must be dict, bytes, or Pydantic model")
 
-            await self.client.publish(subject=subject, payload=payload)
+            await self.client.publish(subject=subject, payload=payload, headers=headers)
 
         except Exception as e:
             logger.error(f"Failed to publish message to {subject}: {e}")
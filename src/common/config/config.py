@@ -1,18 +1,107 @@
+import os
 from pathlib import Path
-import yaml
-from common.models.config import Settings
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
+if TYPE_CHECKING:
+    import argparse
+    from common.models.config import Settings
 
-def load_settings(file_path: str | Path | None = None) -> Settings:
+# settings file used instead of <repo>/settings.yaml
+SETTINGS_PATH_ENV = "MME_SETTINGS"
+# per-key overrides, nested keys joined with "__": MME__ENGINE__DECODE_WORKERS=4
+ENV_PREFIX = "MME__"
+
+_settings: Optional["Settings"] = None
+
+
+def load_settings(file_path: str | Path | None = None, overrides: Iterable[str] = (),
+                  env: Mapping[str, str] | None = None) -> "Settings":
     """Application configuration loader for all modules."""
+    # yaml and pydantic are only imported once settings are actually needed
+    import yaml
+    from common.models.config import Settings
+
+    env = os.environ if env is None else env
     base_dir = Path(__file__).resolve().parents[3]
-    yaml_path = file_path or (base_dir / "settings.yaml")
+    yaml_path = file_path or env.get(SETTINGS_PATH_ENV) or (base_dir / "settings.yaml")
 
     with open(yaml_path, "r") as f:
-        data = yaml.safe_load(f)
+        data = yaml.safe_load(f) or {}
+
+    # env overrides first, command line overrides win
+    for key, value in env_overrides(env):
+        _set_path(data, key, value)
+    for item in overrides:
+        key, value = parse_override(item)
+        _set_path(data, key, value)
 
     return Settings(**data)
 
 
-# singleton instance that shared by all modules
-settings = load_settings()
+def env_overrides(env: Mapping[str, str]) -> List[Tuple[str, Any]]:
+    """(dotted key, value) pairs from MME__SECTION__KEY variables."""
+    import yaml
+
+    pairs = []
+    for name, raw in env.items():
+        if name.startswith(ENV_PREFIX):
+            key = name[len(ENV_PREFIX):].lower().replace("__", ".")
+            pairs.append((key, yaml.safe_load(raw)))
+    return pairs
+
+
+def parse_override(item: str) -> Tuple[str, Any]:
+    """Parse a 'section.key=value' override, the value is read as YAML."""
+    import yaml
+
+    key, sep, raw = item.partition("=")
+    if not sep or not key.strip():
+        raise ValueError(f"invalid override {item!r}, expected section.key=value")
+    return key.strip(), yaml.safe_load(raw)
+
+
+def _set_path(data: Dict[str, Any], key: str, value: Any) -> None:
+    node = data
+    *parents, leaf = key.split(".")
+    for part in parents:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            child = node[part] = {}
+        node = child
+    node[leaf] = value
+
+
+def configure(file_path: str | Path | None = None, overrides: Iterable[str] = ()) -> "Settings":
+    """Load settings with explicit options and make them the shared instance."""
+    global _settings
+    _settings = load_settings(file_path, overrides)
+    return _settings
+
+
+def get_settings() -> "Settings":
+    """Shared settings instance, loaded on first use."""
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
+
+
+def reset_settings() -> None:
+    """Drop the shared instance, the next get_settings() reloads."""
+    global _settings
+    _settings = None
+
+
+def add_config_args(parser: "argparse.ArgumentParser") -> None:
+    """Add --settings and --set options to an entry point parser."""
+    parser.add_argument("--settings", default=None,
+                        help=f"settings file (default: ${SETTINGS_PATH_ENV} or settings.yaml)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a setting, e.g. --set engine.decode_workers=4 (repeatable)")
+
+
+def __getattr__(name: str):
+    # `config.settings` keeps working, but loads on first access instead of at import
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
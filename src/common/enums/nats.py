@@ -3,4 +3,6 @@ from enum import StrEnum
 
 class NatsSubject(StrEnum):
     ORDERS_IN = "orders.in"
-    TRADES_OUT = "trades.out"
\ No newline at end of file
+    TRADES_OUT = "trades.out"
+    BOOK_QUERY = "book.query"
+    ENGINE_CONTROL = "engine.control"
\ No newline at end of file
@@ -9,7 +9,28 @@ class OrderType(StrEnum):
     AMEND = 'amend'
     CREATE = 'create'
     CANCEL = 'cancel'
+    MASS_QUOTE = 'mass_quote'
+    MASS_CANCEL = 'mass_cancel'
 
 class OrderSide(StrEnum):
     BUY = 'B'
-    SELL = 'S'
\ No newline at end of file
+    SELL = 'S'
+
+class OrderKind(StrEnum):
+    LIMIT = 'limit'
+    MARKET = 'market'
+    STOP = 'stop'
+    STOP_LIMIT = 'stop_limit'
+
+class MatchingMode(StrEnum):
+    CONTINUOUS = 'continuous'
+    AUCTION = 'auction'
+
+class SequenceScope(StrEnum):
+    SYMBOL = 'symbol'
+    GLOBAL = 'global'
+
+class TimeInForce(StrEnum):
+    GTC = 'GTC'
+    IOC = 'IOC'
+    FOK = 'FOK'
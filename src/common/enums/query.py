@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+
+class QueryType(StrEnum):
+    ORDER_STATUS = 'order_status'
+    BBO = 'bbo'
+    DEPTH = 'depth'
+
+class OrderStatusType(StrEnum):
+    RESTING = 'resting'
+    PENDING_STOP = 'pending_stop'
+    NOT_FOUND = 'not_found'
@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+
+class EventLoop(StrEnum):
+    AUTO = 'auto'
+    ASYNCIO = 'asyncio'
+    UVLOOP = 'uvloop'
+
+
+class OverflowPolicy(StrEnum):
+    BLOCK = 'block'
+    DROP = 'drop'
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 from common.enums.order import OrderSide
@@ -9,4 +11,5 @@ class BookModel(BaseModel):
     seq: int
     order_id: str
     qty: int
-    side: OrderSide
\ No newline at end of file
+    side: OrderSide
+    owner: Optional[str] = None
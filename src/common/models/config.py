@@ -1,5 +1,9 @@
+from typing import Dict
+
 from pydantic import BaseModel
 from common.enums.nats import NatsSubject
+from common.enums.order import Symbol, MatchingMode, SequenceScope
+from common.enums.runtime import EventLoop, OverflowPolicy
 
 
 class NatsConnectionConfig(BaseModel):
@@ -13,14 +17,89 @@ class NatsConfig(BaseModel):
     orders_subject: NatsSubject = NatsSubject.ORDERS_IN
     consume_subject: NatsSubject = NatsSubject.ORDERS_IN
     trades_subject: NatsSubject = NatsSubject.TRADES_OUT
+    query_subject: NatsSubject = NatsSubject.BOOK_QUERY
+    control_subject: NatsSubject = NatsSubject.ENGINE_CONTROL
     connection: NatsConnectionConfig = NatsConnectionConfig()
 
 
 class EngineConfig(BaseModel):
     input_path: str | None = None
     output_path: str | None = None
+    # per-symbol matching mode, symbols not listed match continuously
+    matching_modes: Dict[Symbol, MatchingMode] = {}
+    auction_interval_ms: int = 1000
+    # 0 decodes on the event loop, >0 uses a process pool with a reorder buffer
+    decode_workers: int = 0
+    decode_max_in_flight: int = 1024
+    # max messages per worker job, batches amortize the inter-process cost
+    decode_batch_size: int = 256
+    # rotating indexed trade journal, replaces output_path when set
+    journal_dir: str | None = None
+    journal_segment_max_bytes: int = 64 * 1024 * 1024
+    journal_segment_max_age_s: int = 3600
+    # ticks from the touch beyond which levels are stored packed, null keeps every level hot
+    cold_distance: int | None = None
+
+
+class TracingConfig(BaseModel):
+    # pusher stamps every order, the engine traces any order carrying a publish stamp
+    enabled: bool = False
+
+
+class QueryConfig(BaseModel):
+    # serve book queries over NATS request-reply from periodic snapshots
+    enabled: bool = False
+    snapshot_interval_ms: int = 100
+
+
+class DedupeConfig(BaseModel):
+    # drop redelivered (symbol, order_id, seq) and report sequence gaps
+    enabled: bool = False
+    window: int = 100_000
+    bloom_capacity: int = 1_000_000
+    bloom_error_rate: float = 1e-6
+    # seq numbering of the feed: one sequence per symbol or one global sequence
+    seq_scope: SequenceScope = SequenceScope.GLOBAL
+
+
+class ProfilerConfig(BaseModel):
+    # on-demand sampling profile via SIGUSR1 or the control subject (unauthenticated, so opt-in)
+    enabled: bool = False
+    interval_ms: float = 5
+    default_duration_s: float = 30
+    max_duration_s: float = 300
+
+
+class ShadowConfig(BaseModel):
+    # run a candidate book backend next to OrderBook and report the first divergence
+    enabled: bool = False
+    book_class: str = "engine.core.booker:OrderBook"
+    cold_distance: int | None = None
+    history: int = 20
+
+
+class RuntimeConfig(BaseModel):
+    # auto uses uvloop when installed
+    event_loop: EventLoop = EventLoop.AUTO
+    log_level: str = "INFO"
+    # log lines are written to stderr by a thread through a bounded queue, dropped when it is full
+    log_enqueue: bool = True
+    log_queue_size: int = 10_000
+    # trade file writes on a dedicated thread instead of the event loop
+    offload_file_io: bool = True
+    # pending writes of that thread, and what a full queue does: block the caller or drop the record
+    offload_queue_size: int = 10_000
+    offload_overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    # log every trade (1), one in N, or none (0)
+    trade_log_every: int = 1
 
 
 class Settings(BaseModel):
     nats: NatsConfig
     engine: EngineConfig
+    tracing: TracingConfig = TracingConfig()
+    query: QueryConfig = QueryConfig()
+    dedupe: DedupeConfig = DedupeConfig()
+    profiler: ProfilerConfig = ProfilerConfig()
+    shadow: ShadowConfig = ShadowConfig()
+    runtime: RuntimeConfig = RuntimeConfig()
@@ -1,7 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
 
-from common.enums.order import OrderType, Symbol, OrderSide
+from common.enums.order import OrderType, Symbol, OrderSide, OrderKind, TimeInForce
 
 class BaseOrder(BaseModel):
     type: OrderType
@@ -12,10 +12,54 @@ class BaseOrder(BaseModel):
 
 class CreateOrder(BaseOrder):
     side: OrderSide
-    price: int
+    # prices index the depth tree, so they can never be negative
+    price: Optional[int] = Field(default=None, ge=0)
     qty: int
+    owner: Optional[str] = None
+    kind: OrderKind = OrderKind.LIMIT
+    tif: TimeInForce = TimeInForce.GTC
+    stop_price: Optional[int] = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def check_price(self) -> "CreateOrder":
+        # limit orders need a price, market orders take any price
+        if self.kind in (OrderKind.LIMIT, OrderKind.STOP_LIMIT) and self.price is None:
+            raise ValueError(f"{self.kind} order requires a price")
+        # stop orders need a trigger price
+        if self.is_stop and self.stop_price is None:
+            raise ValueError(f"{self.kind} order requires a stop_price")
+        return self
+
+    @property
+    def is_stop(self) -> bool:
+        """Stop orders wait for their trigger before matching."""
+        return self.kind in (OrderKind.STOP, OrderKind.STOP_LIMIT)
+
+    @property
+    def limit_price(self) -> Optional[int]:
+        """Worst acceptable price, None means no limit."""
+        return None if self.kind in (OrderKind.MARKET, OrderKind.STOP) else self.price
+
+    @property
+    def can_rest(self) -> bool:
+        """Only GTC limit orders rest their remaining qty."""
+        return self.kind == OrderKind.LIMIT and self.tif == TimeInForce.GTC
 
 class AmendOrder(BaseOrder):
     qty: Optional[int] = None
-    price: Optional[int] = None
+    price: Optional[int] = Field(default=None, ge=0)
+    side: Optional[OrderSide] = None
+
+class QuoteLevel(BaseModel):
+    order_id: str
+    side: OrderSide
+    price: int = Field(ge=0)
+    qty: int
+
+class MassQuoteOrder(BaseOrder):
+    owner: str
+    quotes: List[QuoteLevel] = []
+
+class MassCancelOrder(BaseOrder):
     side: Optional[OrderSide] = None
+    owner: Optional[str] = None
@@ -0,0 +1,44 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from common.enums.order import Symbol, OrderSide
+from common.enums.query import QueryType, OrderStatusType
+
+
+class BookQuery(BaseModel):
+    type: QueryType
+    symbol: Symbol
+    order_id: Optional[str] = None
+    levels: int = Field(default=5, ge=1)
+
+class QueryResponse(BaseModel):
+    symbol: Symbol
+    snapshot_version: int
+    snapshot_age_ms: float
+
+class OrderStatusResponse(QueryResponse):
+    order_id: str
+    status: OrderStatusType
+    side: Optional[OrderSide] = None
+    price: Optional[int] = None
+    qty: Optional[int] = None
+
+class BboResponse(QueryResponse):
+    bid_price: Optional[int] = None
+    bid_qty: Optional[int] = None
+    ask_price: Optional[int] = None
+    ask_qty: Optional[int] = None
+    last_price: Optional[int] = None
+
+class DepthLevel(BaseModel):
+    price: int
+    qty: int
+    orders: int
+
+class DepthResponse(QueryResponse):
+    bids: List[DepthLevel]
+    asks: List[DepthLevel]
+
+class QueryError(BaseModel):
+    error: str
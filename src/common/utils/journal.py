@@ -0,0 +1,255 @@
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+# trade fields that identify the orders of a trade
+ORDER_ID_FIELDS = ("buy_order_id", "sell_order_id")
+
+
+class SegmentIndex:
+    """
+    Sidecar index of one journal segment: order_id -> byte offsets of its
+    trades, plus the ts range covered by the segment.
+    """
+    def __init__(self):
+        self.order_ids: Dict[str, List[int]] = {}
+        self.ts_min: Optional[int] = None
+        self.ts_max: Optional[int] = None
+        self.count: int = 0
+
+    def add(self, record: dict, offset: int) -> None:
+        """Index a record written at the given offset."""
+        for field in ORDER_ID_FIELDS:
+            order_id = record.get(field)
+            if order_id is not None:
+                self.order_ids.setdefault(order_id, []).append(offset)
+
+        ts = record.get("ts")
+        if ts is not None:
+            self.ts_min = ts if self.ts_min is None else min(self.ts_min, ts)
+            self.ts_max = ts if self.ts_max is None else max(self.ts_max, ts)
+        self.count += 1
+
+    def overlaps(self, ts_from: int, ts_to: int) -> bool:
+        """Check if the segment may hold records within [ts_from, ts_to]."""
+        if self.ts_min is None:
+            return False
+        return self.ts_min <= ts_to and self.ts_max >= ts_from
+
+    def to_dict(self) -> dict:
+        return {"order_ids": self.order_ids, "ts_min": self.ts_min, "ts_max": self.ts_max, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SegmentIndex":
+        index = cls()
+        index.order_ids = data["order_ids"]
+        index.ts_min = data["ts_min"]
+        index.ts_max = data["ts_max"]
+        index.count = data["count"]
+        return index
+
+    @classmethod
+    def build(cls, path: Path) -> "SegmentIndex":
+        """Rebuild the index of a segment by scanning it (e.g. after a crash)."""
+        index = cls()
+        offset = 0
+        with path.open("rb") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        index.add(json.loads(line), offset)
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping malformed journal record in {path} at {offset}: {e}")
+                offset += len(line)
+        return index
+
+
+def segment_paths(directory: Path, prefix: str) -> List[Path]:
+    """Journal segments of a directory, oldest first."""
+    return sorted(directory.glob(f"{prefix}-*.ndjson"))
+
+
+def index_path(segment: Path) -> Path:
+    """Sidecar index path of a segment."""
+    return segment.with_suffix(".idx.json")
+
+
+def write_index(segment: Path, index: SegmentIndex) -> None:
+    """Write the sidecar index of a segment atomically, a crash leaves the old file or none."""
+    sidecar = index_path(segment)
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    with tmp.open("w") as f:
+        json.dump(index.to_dict(), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, sidecar)
+
+
+def read_index(segment: Path) -> Optional[SegmentIndex]:
+    """Sidecar index of a segment, None when missing or unreadable."""
+    sidecar = index_path(segment)
+    if not sidecar.exists():
+        return None
+    try:
+        return SegmentIndex.from_dict(json.loads(sidecar.read_text()))
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Unreadable journal index {sidecar}: {e}")
+        return None
+
+
+class TradeJournal:
+    """
+    Append-only ndjson trade journal split into rotating segments.
+
+    A segment is sealed once it exceeds segment_max_bytes or gets older
+    than segment_max_age_s; sealing writes its sidecar index next to it.
+    Exposes write_json so it can stand in for FileManager.
+    """
+    def __init__(self, directory: str, segment_max_bytes: int = 64 * 1024 * 1024,
+                 segment_max_age_s: float = 3600, prefix: str = "trades"):
+        self.directory = Path(directory).resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age_s = segment_max_age_s
+
+        # continue numbering after segments of earlier runs, sealing any left open by a crash
+        existing = segment_paths(self.directory, prefix)
+        for segment in existing:
+            if read_index(segment) is None:
+                write_index(segment, SegmentIndex.build(segment))
+                logger.warning(f"Recovered unsealed journal segment: {segment}")
+        self.segment_no = int(existing[-1].stem.rsplit("-", 1)[1]) if existing else 0
+
+        self.file: Optional[BinaryIO] = None
+        self.path: Optional[Path] = None
+        self.index = SegmentIndex()
+        self.offset = 0
+        self.opened_at = 0.0
+
+    def write_json(self, data: dict | list, append: bool = True) -> None:
+        """Append records to the active segment, rotating when it is full or old."""
+        records = data if isinstance(data, list) else [data]
+
+        try:
+            for record in records:
+                if self.file is None or self._should_rotate():
+                    self.rotate()
+
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                self.file.write(line)
+                self.index.add(record, self.offset)
+                self.offset += len(line)
+
+            self.file.flush()
+        except Exception as e:
+            logger.error(f"Failed to write to {self.path}: {e}")
+
+    def rotate(self) -> None:
+        """Seal the active segment and open the next one."""
+        self._seal()
+
+        self.segment_no += 1
+        self.path = self.directory / f"{self.prefix}-{self.segment_no:06d}.ndjson"
+        self.file = self.path.open("ab")
+        self.offset = 0
+        self.index = SegmentIndex()
+        self.opened_at = time.monotonic()
+        logger.debug(f"Opened journal segment: {self.path}")
+
+    def close(self) -> None:
+        """Seal the active segment."""
+        self._seal()
+
+    def _should_rotate(self) -> bool:
+        if self.offset == 0:
+            return False
+        return (self.offset >= self.segment_max_bytes
+                or time.monotonic() - self.opened_at >= self.segment_max_age_s)
+
+    def _seal(self) -> None:
+        """Close the active segment and write its sidecar index."""
+        if self.file is None:
+            return
+
+        self.file.close()
+        self.file = None
+        write_index(self.path, self.index)
+        logger.debug(f"Sealed journal segment: {self.path}")
+
+
+class JournalReader:
+    """
+    Lookup over journal segments without loading them.
+
+    Sidecar indexes locate the records of an order, which are then read
+    straight from a memory map of the segment. Segments without a sidecar
+    (the active one) are indexed by a scan.
+    """
+    def __init__(self, directory: str, prefix: str = "trades"):
+        self.directory = Path(directory).resolve()
+        self.prefix = prefix
+
+        # sealed segment indexes never change, keep them
+        self.indexes: Dict[Path, SegmentIndex] = {}
+
+    def trades_for_order(self, order_id: str, symbol: Optional[str] = None) -> List[dict]:
+        """All trades of an order, optionally restricted to a symbol."""
+        trades: List[dict] = []
+        for segment in segment_paths(self.directory, self.prefix):
+            offsets = self._index(segment).order_ids.get(order_id)
+            if not offsets:
+                continue
+            for record in self._read_at(segment, offsets):
+                if symbol is None or record.get("symbol") == symbol:
+                    trades.append(record)
+        return trades
+
+    def trades_between(self, ts_from: int, ts_to: int) -> List[dict]:
+        """All trades with ts within [ts_from, ts_to]."""
+        trades: List[dict] = []
+        for segment in segment_paths(self.directory, self.prefix):
+            if not self._index(segment).overlaps(ts_from, ts_to):
+                continue
+            for record in self._read_all(segment):
+                if ts_from <= record.get("ts", ts_from - 1) <= ts_to:
+                    trades.append(record)
+        return trades
+
+    def _index(self, segment: Path) -> SegmentIndex:
+        cached = self.indexes.get(segment)
+        if cached is not None:
+            return cached
+
+        index = read_index(segment)
+        if index is not None:
+            self.indexes[segment] = index
+            return index
+
+        # active segment (or a sidecar torn by a crash): index what is there now, do not cache
+        return SegmentIndex.build(segment)
+
+    @staticmethod
+    def _read_at(segment: Path, offsets: List[int]) -> Iterator[dict]:
+        """Read the records starting at the given offsets."""
+        if segment.stat().st_size == 0:
+            return
+        with segment.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in offsets:
+                end = mm.find(b"\n", offset)
+                yield json.loads(mm[offset:end if end != -1 else len(mm)])
+
+    @staticmethod
+    def _read_all(segment: Path) -> Iterator[dict]:
+        """Read every record of a segment."""
+        if segment.stat().st_size == 0:
+            return
+        with segment.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                if line.strip():
+                    yield json.loads(line)
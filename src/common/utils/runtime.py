@@ -0,0 +1,196 @@
+import asyncio
+import atexit
+import queue
+import sys
+import threading
+from typing import Any, Callable, Coroutine, Optional, TextIO, TypeVar
+
+from loguru import logger
+
+from common.enums.runtime import EventLoop, OverflowPolicy
+
+T = TypeVar("T")
+
+# stops the queued log writer
+_STOP = object()
+
+# active queued stderr sink, replaced on every configure_logging
+_log_sink: Optional["QueueSink"] = None
+
+
+def loop_factory(kind: EventLoop = EventLoop.AUTO) -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Event loop constructor for a loop kind, None means the asyncio default."""
+    if kind == EventLoop.ASYNCIO:
+        return None
+
+    # uvloop is optional, auto falls back to asyncio without it
+    try:
+        import uvloop
+    except ImportError:
+        if kind == EventLoop.UVLOOP:
+            raise RuntimeError("event_loop is 'uvloop' but uvloop is not installed")
+        return None
+    return uvloop.new_event_loop
+
+
+def run(main: Coroutine[Any, Any, T], kind: EventLoop = EventLoop.AUTO) -> T:
+    """asyncio.run on the configured event loop."""
+    factory = loop_factory(kind)
+    with asyncio.Runner(loop_factory=factory) as runner:
+        logger.info(f"Event loop: {type(runner.get_loop()).__module__}")
+        return runner.run(main)
+
+
+class QueueSink:
+    """
+    loguru sink that hands formatted lines to a writer thread.
+
+    loguru formats a record on the thread that logs it; this sink only
+    puts the resulting line on a bounded queue and returns. When the
+    stream falls behind and the queue is full, lines are dropped and
+    counted instead of blocking the caller, and the count is written
+    once the writer catches up.
+    """
+    def __init__(self, stream: TextIO, maxsize: int = 10_000, name: str = "log-writer"):
+        self.stream = stream
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def __call__(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def stop(self, timeout: float = 5) -> None:
+        """Write what is queued and stop the writer thread."""
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+
+    def _run(self) -> None:
+        reported = 0
+        while True:
+            message = self.queue.get()
+            if message is _STOP:
+                break
+
+            if self.dropped != reported:
+                dropped = self.dropped
+                self.stream.write(f"[{dropped - reported} log lines dropped, stream too slow]\n")
+                reported = dropped
+
+            try:
+                self.stream.write(message)
+                if self.queue.empty():
+                    self.stream.flush()
+            except Exception:
+                # nowhere left to report a failing stream
+                pass
+
+
+def configure_logging(level: str = "INFO", enqueue: bool = True, queue_size: int = 10_000) -> None:
+    """
+    Replace the default loguru sink.
+
+    With enqueue, records are still formatted on the calling thread but
+    written to stderr by a QueueSink thread; a slow stderr costs dropped
+    lines instead of a blocked event loop.
+    """
+    global _log_sink
+
+    logger.remove()
+    if _log_sink is not None:
+        _log_sink.stop()
+        _log_sink = None
+
+    if not enqueue:
+        logger.add(sys.stderr, level=level)
+        return
+
+    _log_sink = QueueSink(sys.stderr, maxsize=queue_size)
+    logger.add(_log_sink, level=level, colorize=sys.stderr.isatty())
+
+
+@atexit.register
+def _stop_logging() -> None:
+    # write out queued lines before the interpreter exits
+    if _log_sink is not None:
+        _log_sink.stop()
+
+
+class LogSampler:
+    """
+    Decides which of a stream of log lines are written: every line
+    (every=1), one in `every`, or none (every=0).
+    """
+    def __init__(self, every: int = 1):
+        self.every = every
+        self.count = 0
+
+    def __call__(self) -> bool:
+        if self.every <= 0:
+            return False
+        self.count += 1
+        return self.every == 1 or self.count % self.every == 1
+
+
+class OffloadWriter:
+    """
+    Runs the writes of a FileManager or TradeJournal on one dedicated thread.
+
+    write_json only hands the record over and returns; a single worker
+    keeps records in submission order and owns the underlying file, so it
+    needs no locking. The hand-off queue holds at most max_pending writes;
+    once full, BLOCK makes write_json wait for the writer (no record is
+    lost, the caller is held up) and DROP discards the record and counts
+    it. close() waits for pending writes.
+    """
+    def __init__(self, sink, name: str = "trade-writer", max_pending: int = 10_000,
+                 overflow: OverflowPolicy = OverflowPolicy.BLOCK):
+        self.sink = sink
+        self.overflow = overflow
+        self.dropped = 0
+        self.queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def write_json(self, data: dict | list, append: bool = True) -> None:
+        if self.overflow == OverflowPolicy.BLOCK:
+            self.queue.put((data, append))
+            return
+
+        try:
+            self.queue.put_nowait((data, append))
+        except queue.Full:
+            if not self.dropped:
+                logger.warning("Trade writer is behind, dropping trade records")
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            self._write(*item)
+
+    def _write(self, data: dict | list, append: bool) -> None:
+        try:
+            self.sink.write_json(data, append=append)
+        except Exception as e:
+            logger.error(f"Failed to write trade record: {e}")
+
+    def close(self) -> None:
+        """Flush pending writes and close the sink."""
+        self.queue.put(_STOP)
+        self.thread.join()
+        if self.dropped:
+            logger.warning(f"Trade writer dropped {self.dropped} records")
+        if hasattr(self.sink, "close"):
+            self.sink.close()
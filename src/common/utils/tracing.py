@@ -0,0 +1,101 @@
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+# trace stamps carried in NATS headers, wall clock nanoseconds
+TRACE_PUBLISH = "Trace-Publish-Ns"
+TRACE_RECEIVE = "Trace-Receive-Ns"
+TRACE_MATCH = "Trace-Match-Ns"
+TRACE_TRADE_PUBLISH = "Trace-Trade-Publish-Ns"
+
+TRACE_KEYS = (TRACE_PUBLISH, TRACE_RECEIVE, TRACE_MATCH, TRACE_TRADE_PUBLISH)
+
+
+def now_ns() -> int:
+    """Wall clock timestamp shared by pusher and engine hosts."""
+    return time.time_ns()
+
+
+def publish_headers() -> Dict[str, str]:
+    """Headers for an order published by the pusher."""
+    return {TRACE_PUBLISH: str(now_ns())}
+
+
+def mark_received(msg) -> None:
+    """Stamp the engine receive time on a traced message."""
+    if msg.headers and TRACE_PUBLISH in msg.headers:
+        msg.headers[TRACE_RECEIVE] = str(now_ns())
+
+
+def trace_context(msg) -> Optional[Dict[str, str]]:
+    """Trace stamps of a message stamped by mark_received, None if it is not traced."""
+    if not msg.headers or TRACE_RECEIVE not in msg.headers:
+        return None
+    return {key: msg.headers[key] for key in TRACE_KEYS if key in msg.headers}
+
+
+def stage_latencies(headers: Dict[str, str], received_ns: int) -> Dict[str, int]:
+    """Split an order-to-trade round trip into per-stage latencies (ns)."""
+    stamps = {key: int(headers[key]) for key in TRACE_KEYS if key in headers}
+    stages: Dict[str, int] = {}
+
+    # (stage, from, to); stages with a missing stamp are skipped
+    for stage, start, end in (
+        ("nats_in", TRACE_PUBLISH, TRACE_RECEIVE),
+        ("decode_match", TRACE_RECEIVE, TRACE_MATCH),
+        ("trade_io", TRACE_MATCH, TRACE_TRADE_PUBLISH),
+    ):
+        if start in stamps and end in stamps:
+            stages[stage] = stamps[end] - stamps[start]
+
+    if TRACE_TRADE_PUBLISH in stamps:
+        stages["nats_out"] = received_ns - stamps[TRACE_TRADE_PUBLISH]
+    if TRACE_PUBLISH in stamps:
+        stages["round_trip"] = received_ns - stamps[TRACE_PUBLISH]
+
+    return stages
+
+
+def percentile(values: List[int], q: float) -> int:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+class LatencyRecorder:
+    """
+    Collects per-stage latency samples and reports percentiles.
+    """
+    def __init__(self, quantiles: Iterable[float] = (50, 90, 99, 99.9)):
+        self.quantiles = tuple(quantiles)
+        self.samples: Dict[str, List[int]] = {}
+
+    def record(self, stages: Dict[str, int]) -> None:
+        """Add one sample per stage."""
+        for stage, value in stages.items():
+            self.samples.setdefault(stage, []).append(value)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles per stage in microseconds."""
+        result: Dict[str, Dict[str, float]] = {}
+        for stage, values in self.samples.items():
+            ordered = sorted(values)
+            stats = {f"p{q:g}": percentile(ordered, q) / 1000 for q in self.quantiles}
+            stats["max"] = ordered[-1] / 1000
+            stats["count"] = len(ordered)
+            result[stage] = stats
+        return result
+
+    def report(self) -> None:
+        """Log the latency summary."""
+        if not self.samples:
+            logger.warning("No traced trades received.")
+            return
+
+        for stage, stats in self.summary().items():
+            values = ", ".join(f"{k}={v:.1f}us" if k != "count" else f"{k}={v:g}" for k, v in stats.items())
+            logger.info(f"Latency {stage}: {values}")
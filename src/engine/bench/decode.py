@@ -0,0 +1,112 @@
+"""
+Decode throughput: inline on the event loop vs the DecodePipeline pool.
+
+For each mode it feeds the same create messages through decode + a
+no-op sink and reports, per mode:
+
+- msgs_per_s:      end-to-end throughput
+- cpu_us_per_msg:  CPU of the engine process per message (all its threads,
+                   worker processes excluded), i.e. what the matcher's
+                   interpreter pays under the GIL
+
+    python -m engine.bench.decode --messages 50000 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+from engine.core.decoder import decode_order
+from engine.core.pipeline import DecodePipeline, worker_pool
+
+
+class _Msg:
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def _messages(count: int) -> List[_Msg]:
+    return [
+        _Msg(json.dumps({"type": "create", "ts": 1000 + seq, "seq": seq, "symbol": "ABC",
+                         "side": "B" if seq % 2 else "S", "order_id": f"O{seq}", "price": 100 + seq % 50,
+                         "qty": 1 + seq % 10, "owner": "MM1"}).encode())
+        for seq in range(1, count + 1)
+    ]
+
+
+def _result(count: int, wall: float, cpu: float) -> Dict[str, float]:
+    return {"msgs_per_s": count / wall, "cpu_us_per_msg": cpu / count * 1e6}
+
+
+async def run_inline(messages: List[_Msg]) -> Dict[str, float]:
+    """Decode every message on the loop, like decode_workers: 0."""
+    received = 0
+
+    async def sink(msg, order):
+        nonlocal received
+        received += 1
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    for msg in messages:
+        order = decode_order(msg.data)
+        if order is not None:
+            await sink(msg, order)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    assert received == len(messages)
+    return _result(received, wall, cpu)
+
+
+async def run_pipeline(messages: List[_Msg], workers: int, max_in_flight: int = 1024) -> Dict[str, float]:
+    """Decode in a process pool through the reorder buffer."""
+    received = 0
+
+    async def sink(msg, order):
+        nonlocal received
+        received += 1
+
+    executor = worker_pool(workers)
+    # warm the workers up so process start-up is not measured
+    await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(executor, decode_order, messages[0].data)
+                           for _ in range(workers)))
+
+    pipeline = DecodePipeline(sink=sink, workers=workers, max_in_flight=max_in_flight, executor=executor)
+    pipeline.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    for msg in messages:
+        await pipeline.submit(msg)
+    await pipeline.join()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    await pipeline.close()
+
+    assert received == len(messages)
+    return _result(received, wall, cpu)
+
+
+async def measure(count: int = 50_000, workers: List[int] = (1, 2, 4)) -> Dict[str, Dict[str, float]]:
+    messages = _messages(count)
+    results = {"inline": await run_inline(messages)}
+    for n in workers:
+        results[f"workers={n}"] = await run_pipeline(messages, n)
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Decode throughput, inline vs worker pool.")
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(measure(args.messages, args.workers))
+    print(json.dumps({mode: {k: round(v, 2) for k, v in r.items()} for mode, r in results.items()}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
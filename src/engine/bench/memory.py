@@ -0,0 +1,167 @@
+"""
+Memory and allocation profile of OrderBook / Matcher.
+
+Fills a book with a configurable resting population, runs create, cancel
+and fill flows under tracemalloc and reports:
+
+- bytes_per_order:   retained bytes per resting order
+- bytes_per_level:   retained bytes per extra hot price level
+- blocks_per_create: net memory blocks allocated per resting create
+- blocks_per_cancel: net memory blocks released per cancel
+- blocks_per_fill:   net memory blocks per fill, trade kept alive and the
+                     filled maker released (negative when makers dominate)
+- peak_bytes_per_fill: transient peak bytes per fill while matching
+- peak_rss_mb:       peak resident set size of the process
+
+Exits with status 1 when a configured budget is exceeded.
+
+    python -m engine.bench.memory --orders 100000 --max-bytes-per-order 1500
+"""
+import argparse
+import asyncio
+import gc
+import json
+import resource
+import sys
+import tracemalloc
+from typing import Dict, List, Optional
+
+from common.enums.order import OrderSide, OrderType, Symbol
+from common.models.orders import BaseOrder, CreateOrder
+from engine.core.matcher import Matcher
+
+# metric name -> budget option
+BUDGETS = {
+    "bytes_per_order": "max_bytes_per_order",
+    "bytes_per_level": "max_bytes_per_level",
+    "blocks_per_create": "max_blocks_per_create",
+    "blocks_per_cancel": "max_blocks_per_cancel",
+    "blocks_per_fill": "max_blocks_per_fill",
+    "peak_bytes_per_fill": "max_peak_bytes_per_fill",
+    "peak_rss_mb": "max_rss_mb",
+}
+
+
+def _create(seq: int, side: OrderSide, price: int, qty: int = 5, prefix: str = "R") -> CreateOrder:
+    # every phase has its own id prefix, so ids never collide with orders still resting
+    return CreateOrder(type=OrderType.CREATE, ts=seq, seq=seq, symbol=Symbol.ABC, side=side,
+                       order_id=f"{prefix}{seq}", price=price, qty=qty)
+
+
+def _traced() -> tuple[int, int]:
+    """Current traced bytes and live blocks."""
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    stats = snapshot.statistics("filename")
+    return sum(s.size for s in stats), sum(s.count for s in stats)
+
+
+async def _rest(matcher: Matcher, orders: int, levels: int, start_seq: int = 1, prefix: str = "R") -> None:
+    """Rest bids below 10_000 and asks above it, spread over the given levels per side."""
+    for i in range(orders):
+        seq = start_seq + i
+        offset = 1 + i // 2 % levels
+        if i % 2 == 0:
+            await matcher.handle_event(_create(seq, OrderSide.BUY, 10_000 - offset, prefix=prefix))
+        else:
+            await matcher.handle_event(_create(seq, OrderSide.SELL, 10_000 + offset, prefix=prefix))
+
+
+async def profile(orders: int = 100_000, levels: int = 1_000, flow: int = 10_000,
+                  cold_distance: Optional[int] = None) -> Dict[str, float]:
+    """Run the profile and return the metrics."""
+    metrics: Dict[str, float] = {}
+    tracemalloc.start()
+
+    try:
+        # bytes per resting order
+        matcher = Matcher(cold_distance=cold_distance)
+        before, blocks_before = _traced()
+        await _rest(matcher, orders, levels)
+        after, blocks_after = _traced()
+        metrics["bytes_per_order"] = (after - before) / orders
+        metrics["blocks_per_create"] = (blocks_after - blocks_before) / orders
+
+        # bytes per level: same number of orders on one level vs one level each (hot levels only)
+        count = min(flow, 2_000)
+        one_level, many_levels = Matcher(), Matcher()
+        base, _ = _traced()
+        for seq in range(1, count + 1):
+            await one_level.handle_event(_create(seq, OrderSide.BUY, 5_000, prefix="L"))
+        single, _ = _traced()
+        for seq in range(1, count + 1):
+            await many_levels.handle_event(_create(seq, OrderSide.BUY, 5_000 - seq, prefix="L"))
+        multi, _ = _traced()
+        metrics["bytes_per_level"] = ((multi - single) - (single - base)) / max(count - 1, 1)
+        del one_level, many_levels
+
+        # cancels: release part of the resting population
+        cancels = min(flow, orders)
+        before, blocks_before = _traced()
+        for seq in range(1, cancels + 1):
+            await matcher.handle_event(BaseOrder(type=OrderType.CANCEL, ts=orders + seq, seq=orders + seq,
+                                                 symbol=Symbol.ABC, order_id=f"R{seq}"))
+        after, blocks_after = _traced()
+        metrics["blocks_per_cancel"] = (blocks_before - blocks_after) / cancels
+
+        # fills: aggressive orders taking from the touch, one maker each
+        await _rest(matcher, flow * 2, levels, start_seq=orders + cancels + 1, prefix="M")
+        fills: List = []
+        before, blocks_before = _traced()
+        tracemalloc.reset_peak()
+        for i in range(flow):
+            side = OrderSide.BUY if i % 2 == 0 else OrderSide.SELL
+            price = 20_000 if side == OrderSide.BUY else 1
+            fills.extend(await matcher.handle_event(_create(orders + cancels + flow * 2 + 1 + i, side, price,
+                                                            prefix="T")))
+        _, peak = tracemalloc.get_traced_memory()
+        after, blocks_after = _traced()
+        # makers and takers have the same qty: one trade per taker, or the metrics measure nothing
+        assert len(fills) == flow, f"fill phase produced {len(fills)} trades, expected {flow}"
+        del fills
+        fill_count = max(flow, 1)
+        metrics["blocks_per_fill"] = (blocks_after - blocks_before) / fill_count
+        metrics["peak_bytes_per_fill"] = (peak - before) / fill_count
+    finally:
+        tracemalloc.stop()
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    metrics["peak_rss_mb"] = rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return metrics
+
+
+def check_budgets(metrics: Dict[str, float], budgets: Dict[str, Optional[float]]) -> List[str]:
+    """Return a message for each metric above its budget."""
+    failures = []
+    for metric, option in BUDGETS.items():
+        budget = budgets.get(option)
+        if budget is not None and metrics.get(metric, 0) > budget:
+            failures.append(f"{metric}={metrics[metric]:.1f} exceeds budget {budget:g}")
+    return failures
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OrderBook memory and allocation profile.")
+    parser.add_argument("--orders", type=int, default=100_000, help="resting orders")
+    parser.add_argument("--levels", type=int, default=1_000, help="price levels per side")
+    parser.add_argument("--flow", type=int, default=10_000, help="cancels and fills to run")
+    parser.add_argument("--cold-distance", type=int, default=None, help="profile a tiered book")
+    for option in BUDGETS.values():
+        parser.add_argument(f"--{option.replace('_', '-')}", dest=option, type=float, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    metrics = asyncio.run(profile(args.orders, args.levels, args.flow, args.cold_distance))
+    print(json.dumps({k: round(v, 2) for k, v in metrics.items()}, indent=2))
+
+    failures = check_budgets(metrics, vars(args))
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
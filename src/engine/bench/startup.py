@@ -0,0 +1,111 @@
+"""
+Startup time of the engine and pusher entry points.
+
+Each measurement runs in a fresh interpreter and reports the median over
+the repeats, in milliseconds:
+
+- interpreter_ms: `python -c pass`, the floor every process pays
+- <entry>.import_ms:  importing the entry point module
+- <entry>.config_ms:  importing it and loading settings
+- <entry>.overhead_ms: config_ms above the interpreter floor
+
+--top N also lists the N slowest imports of each entry point
+(cumulative, from `python -X importtime`). Exits with status 1 when an
+entry point exceeds --max-overhead-ms.
+
+    python -m engine.bench.startup --repeats 20 --max-overhead-ms 400
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# entry point name -> module
+ENTRY_POINTS = {
+    "engine": "engine.main",
+    "pusher": "pusher.main",
+}
+
+SRC_DIR = Path(__file__).resolve().parents[2]
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC_DIR), env.get("PYTHONPATH")) if p)
+    return env
+
+
+def _time(code: str, repeats: int) -> float:
+    """Median wall time of running code in a fresh interpreter."""
+    env = _env()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def slowest_imports(module: str, top: int) -> List[Tuple[str, float]]:
+    """Top cumulative import times of a module in ms."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=_env(), check=True, capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        entries.append((parts[2].strip(), int(parts[1]) / 1000))
+    return sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+
+
+def measure(repeats: int = 10, entry_points: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    """Run the startup benchmark and return the metrics."""
+    metrics = {"interpreter_ms": _time("pass", repeats)}
+    for name, module in (entry_points or ENTRY_POINTS).items():
+        metrics[f"{name}.import_ms"] = _time(f"import {module}", repeats)
+        metrics[f"{name}.config_ms"] = _time(
+            f"import {module}; from common.config.config import get_settings; get_settings()", repeats)
+        metrics[f"{name}.overhead_ms"] = metrics[f"{name}.config_ms"] - metrics["interpreter_ms"]
+    return metrics
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Entry point startup time.")
+    parser.add_argument("--repeats", type=int, default=10, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=0, help="list the slowest imports of each entry point")
+    parser.add_argument("--max-overhead-ms", type=float, default=None,
+                        help="fail when an entry point starts slower than this above the interpreter floor")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    metrics = measure(args.repeats)
+    print(json.dumps({k: round(v, 1) for k, v in metrics.items()}, indent=2))
+
+    if args.top:
+        for name, module in ENTRY_POINTS.items():
+            print(f"\nslowest imports of {module}:")
+            for imported, ms in slowest_imports(module, args.top):
+                print(f"  {ms:8.1f} ms  {imported}")
+
+    failures = []
+    if args.max_overhead_ms is not None:
+        for name in ENTRY_POINTS:
+            overhead = metrics[f"{name}.overhead_ms"]
+            if overhead > args.max_overhead_ms:
+                failures.append(f"{name}.overhead_ms={overhead:.1f} exceeds budget {args.max_overhead_ms:g}")
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,30 @@
 from collections import deque
-from typing import Deque, Dict, Optional
+from typing import Deque, Dict, Optional, Set, List, Tuple
 
-from common.enums.order import Symbol, OrderSide
+from common.enums.order import Symbol, OrderSide, MatchingMode
 from sortedcontainers import SortedDict
 from common.models.booker import BookModel
 from common.models.orders import CreateOrder, AmendOrder
+from engine.core.changes import BookChanges
+from engine.core.depth import DepthIndex
+from engine.core.tiering import ColdLevel, ColdTier
+from engine.core.triggers import TriggerIndex
 
 
 class OrderBook:
-    """OrderBook is a simple book keeper"""
-    def __init__(self, symbol: Symbol):
+    """
+    OrderBook is a simple book keeper
+
+    With cold_distance set, levels further than cold_distance ticks from
+    the touch are kept packed in a cold tier and promoted back when the
+    touch comes within cold_distance. Hot levels are packed again once
+    they drift beyond twice that distance, so levels do not flap.
+    """
+    def __init__(self, symbol: Symbol, mode: MatchingMode = MatchingMode.CONTINUOUS,
+                 cold_distance: Optional[int] = None):
         self.symbol = symbol
+        self.mode = mode
+        self.cold_distance = cold_distance
 
         # active order books (buy = bids, sell = asks)
         self.bids: SortedDict[int, Deque[BookModel]] = SortedDict()
@@ -19,7 +33,43 @@ class OrderBook:
         # lookup table for fast access by order_id
         self.lookup: Dict[str, BookModel] = {}
 
+        # packed far-from-touch levels (only used with cold_distance)
+        self.cold_bids = ColdTier(OrderSide.BUY)
+        self.cold_asks = ColdTier(OrderSide.SELL)
+
+        # owner index (owner -> order ids) for mass cancel and mass quote
+        self.owners: Dict[str, Set[str]] = {}
+
+        # cumulative resting qty per side, used for FOK feasibility
+        self.bid_depth = DepthIndex()
+        self.ask_depth = DepthIndex()
+
+        # pending stop orders and the last trade price that fires them
+        self.stops = TriggerIndex()
+        self.last_price: Optional[int] = None
+
+        # bumped on every mutation, lets readers skip unchanged books
+        self.version: int = 0
+
+        # touched levels and orders, only recorded once a reader attaches
+        self.changes: Optional[BookChanges] = None
+
+    def track_changes(self) -> BookChanges:
+        """Start recording touched levels and orders for an incremental reader."""
+        if self.changes is None:
+            self.changes = BookChanges()
+        return self.changes
+
     def add_order(self, order: CreateOrder):
+        self.version += 1
+
+        # far from the touch and not joining a hot level: store packed
+        if order.price not in self.__get_books(side=order.side) and self.__is_far(side=order.side, price=order.price):
+            self.__get_cold(side=order.side).add(order.price, order.order_id, order.ts, order.seq, order.qty,
+                                                 order.owner)
+            self.__link(order.order_id, order.side, order.price, order.qty, order.owner)
+            return
+
         # build book model from order data
         book_data = BookModel(
             price=order.price,
@@ -27,7 +77,8 @@ class OrderBook:
             ts=order.ts,
             order_id=order.order_id,
             qty=order.qty,
-            side=order.side
+            side=order.side,
+            owner=order.owner
         )
 
         # select correct book (buy or sell)
@@ -54,13 +105,28 @@ class OrderBook:
 
         # store reference for quick lookup
         self.lookup[order.order_id] = book_data
+        self.__link(order.order_id, order.side, order.price, order.qty, order.owner)
+        self.__rebalance(side=order.side)
 
     def cancel_order(self, order_id: str):
         """Cancel an existing order by ID."""
+        self.version += 1
         book_data = self.lookup.pop(order_id, None)
         if not book_data:
+            # may be a packed far order or a pending stop order
+            for cold in (self.cold_bids, self.cold_asks):
+                removed = cold.remove(order_id)
+                if removed:
+                    price, qty, owner = removed
+                    self.__unlink(order_id, cold.side, price, qty, owner)
+                    return
+            stop = self.stops.cancel(order_id)
+            if stop is not None and self.changes is not None:
+                self.changes.orders.add(order_id)
             return
 
+        self.__unlink(order_id, book_data.side, book_data.price, book_data.qty, book_data.owner)
+
         # get correct book (bids or asks)
         books = self.__get_books(side=book_data.side)
         if not books:
@@ -79,9 +145,64 @@ class OrderBook:
         # if no more orders at this price, remove price level
         if not dq:
             del books[book_data.price]
+            self.__rebalance(side=book_data.side)
+
+    def mass_cancel(self, side: Optional[OrderSide] = None, owner: Optional[str] = None,
+                    include_stops: bool = True) -> List[str]:
+        """
+        Cancel every order matching the given side and/or owner, return cancelled ids.
+        Pending stops go as well unless include_stops is False.
+        """
+        self.version += 1
+
+        # pending stops are not in the price levels
+        stop_ids = self.stops.cancel_where(side=side, owner=owner) if include_stops else []
+        if self.changes is not None:
+            self.changes.orders.update(stop_ids)
+
+        # whole book or whole side: drop price levels at once instead of per-order removal
+        if owner is None:
+            sides = [side] if side is not None else [OrderSide.BUY, OrderSide.SELL]
+            cancelled: List[str] = stop_ids
+            for s in sides:
+                books = self.__get_books(side=s)
+                for dq in books.values():
+                    for book_data in dq:
+                        self.lookup.pop(book_data.order_id, None)
+                        self.__unlink_owner(book_data.order_id, book_data.owner)
+                        self.__mark(s, book_data.price, book_data.order_id)
+                        cancelled.append(book_data.order_id)
+                books.clear()
+
+                cold = self.__get_cold(side=s)
+                for order_id, price, _, order_owner in cold.orders():
+                    self.__unlink_owner(order_id, order_owner)
+                    self.__mark(s, price, order_id)
+                    cancelled.append(order_id)
+                cold.clear()
+
+                self.__get_depth(side=s).clear()
+            return cancelled
+
+        # owner scoped: resolve candidates through the owner index
+        order_ids = [
+            order_id for order_id in self.owners.get(owner, ())
+            if side is None or self.side_of(order_id) == side
+        ]
+        for order_id in order_ids:
+            self.cancel_order(order_id)
+        return stop_ids + order_ids
 
     def amend_order(self, amend: AmendOrder) -> Optional[BookModel]:
         """Amend an existing order (price or quantity)."""
+        self.version += 1
+
+        # packed orders are promoted with their level before being amended
+        for cold in (self.cold_bids, self.cold_asks):
+            price = cold.prices.get(amend.order_id)
+            if price is not None:
+                self.__promote(side=cold.side, price=price)
+
         book_data = self.lookup.get(amend.order_id)
         if not book_data:
             return None
@@ -93,9 +214,18 @@ class OrderBook:
 
         side = amend.side or book_data.side
         books = self.__get_books(side)
+        depth = self.__get_depth(side)
+
+        # take the order out of the depth index, re-add with the amended values
+        depth.add(book_data.price, -book_data.qty)
+        self.__mark(side, book_data.price, book_data.order_id)
 
         # handle price change (move between price levels)
         if amend.price is not None and amend.price != book_data.price:
+            # joining a packed level: unpack it first so the level stays in one tier
+            if amend.price in self.__get_cold(side=side).levels:
+                self.__promote(side=side, price=amend.price)
+
             old_price = book_data.price
             dq_old = books.get(old_price)
             if dq_old:
@@ -120,6 +250,10 @@ class OrderBook:
         if amend.qty is not None:
             book_data.qty = amend.qty
 
+        depth.add(book_data.price, book_data.qty)
+        self.__mark(side, book_data.price, book_data.order_id)
+        self.__rebalance(side=side)
+
         return book_data
 
     def get_best_bid(self) -> BookModel | None:
@@ -145,22 +279,190 @@ class OrderBook:
             return dq[0]
         return None
 
+    def equilibrium_price(self) -> Optional[Tuple[int, int]]:
+        """
+        Find the auction uncross price and its executable volume.
+
+        Candidates are the level prices inside the crossed range. The price
+        with the highest executable volume wins, then the smallest imbalance,
+        then the one closest to the last trade price, then the lowest.
+        """
+        best_bid = self.get_best_bid()
+        best_ask = self.get_best_ask()
+        if not best_bid or not best_ask or best_bid.price < best_ask.price:
+            return None
+
+        low, high = best_ask.price, best_bid.price
+        candidates = set()
+        for levels in (self.bids, self.asks, self.cold_bids.levels, self.cold_asks.levels):
+            candidates.update(levels.irange(low, high))
+        reference = self.last_price if self.last_price is not None else (low + high) // 2
+
+        best: Optional[Tuple[int, int, int, int]] = None
+        for price in candidates:
+            demand = self.bid_depth.at_or_above(price)
+            supply = self.ask_depth.prefix(price)
+            volume = min(demand, supply)
+            key = (-volume, abs(demand - supply), abs(price - reference), price)
+            if best is None or key < best:
+                best = key
+
+        return best[3], -best[0]
+
+    def park_stop(self, order: CreateOrder) -> None:
+        """Hold a stop order until its trigger price trades."""
+        self.version += 1
+        self.stops.add(order)
+        if self.changes is not None:
+            self.changes.orders.add(order.order_id)
+
+    def pop_triggered_stops(self, low: int, high: int) -> List[CreateOrder]:
+        """Pop stops fired by trades printed within [low, high]."""
+        self.version += 1
+        triggered = self.stops.pop_triggered(low=low, high=high)
+        if self.changes is not None:
+            self.changes.orders.update(order.order_id for order in triggered)
+        return triggered
+
     def is_active(self, order_id: str) -> bool:
-        """Check if an order is still active."""
-        return order_id in self.lookup
+        """Check if an order is still active (resting, packed or pending stop)."""
+        return (order_id in self.lookup or order_id in self.cold_bids or order_id in self.cold_asks
+                or order_id in self.stops)
+
+    def side_of(self, order_id: str) -> Optional[OrderSide]:
+        """Side of a resting order, hot or packed."""
+        book_data = self.lookup.get(order_id)
+        if book_data:
+            return book_data.side
+        if order_id in self.cold_bids:
+            return OrderSide.BUY
+        if order_id in self.cold_asks:
+            return OrderSide.SELL
+        return None
 
     def reduce_qty(self, order_id: str, qty: int):
         """Reduce quantity of an active order."""
+        self.version += 1
         book_data = self.lookup.get(order_id)
         if not book_data:
             return
 
+        # remove if fully filled
+        if qty >= book_data.qty:
+            self.cancel_order(order_id)
+            return
+
         # reduce remaining quantity
         book_data.qty -= qty
+        self.__get_depth(side=book_data.side).add(book_data.price, -qty)
+        self.__mark(book_data.side, book_data.price, order_id)
+
+    def fillable_qty(self, side: OrderSide, price: Optional[int] = None) -> int:
+        """
+        Qty an incoming order of the given side could fill right now.
+        price is the taker's limit, None means market.
+        """
+        if side == OrderSide.BUY:
+            return self.ask_depth.total if price is None else self.ask_depth.prefix(price)
+
+        return self.bid_depth.total if price is None else self.bid_depth.at_or_above(price)
+
+    def __link(self, order_id: str, side: OrderSide, price: int, qty: int, owner: Optional[str]) -> None:
+        """Add a resting order to the depth and owner indexes."""
+        self.__get_depth(side=side).add(price, qty)
+        self.__mark(side, price, order_id)
+        if owner is not None:
+            self.owners.setdefault(owner, set()).add(order_id)
+
+    def __unlink(self, order_id: str, side: OrderSide, price: int, qty: int, owner: Optional[str]) -> None:
+        """Remove a resting order from the depth and owner indexes."""
+        self.__get_depth(side=side).add(price, -qty)
+        self.__mark(side, price, order_id)
+        self.__unlink_owner(order_id, owner)
+
+    def __mark(self, side: OrderSide, price: int, order_id: str) -> None:
+        """Record a touched level and order for the attached reader, if any."""
+        if self.changes is not None:
+            self.changes.mark(side, price, order_id)
+    def __unlink_owner(self, order_id: str, owner: Optional[str]) -> None:
+        """Remove an order from the owner index."""
+        if owner is None:
+            return
 
-        # remove if fully filled
-        if book_data.qty <= 0:
-            self.cancel_order(order_id)
+        order_ids = self.owners.get(owner)
+        if order_ids is None:
+            return
+
+        order_ids.discard(order_id)
+        if not order_ids:
+            del self.owners[owner]
+
+    def __distance(self, side: OrderSide, price: int, touch: int) -> int:
+        """Ticks between a price and the touch, positive when behind it."""
+        return touch - price if side == OrderSide.BUY else price - touch
+
+    def __touch(self, side: OrderSide) -> Optional[int]:
+        """Best hot price of a side."""
+        books = self.__get_books(side=side)
+        if not books:
+            return None
+        return books.peekitem(-1 if side == OrderSide.BUY else 0)[0]
+
+    def __is_far(self, side: OrderSide, price: int) -> bool:
+        """Check if a new order belongs in the cold tier."""
+        if self.cold_distance is None:
+            return False
+        touch = self.__touch(side=side)
+        return touch is not None and self.__distance(side, price, touch) > self.cold_distance
+
+    def __promote(self, side: OrderSide, price: int) -> None:
+        """Unpack a cold level into the hot book."""
+        dq = self.__get_cold(side=side).pop_level(price).unpack(price, side)
+        self.__get_books(side=side)[price] = dq
+        for book_data in dq:
+            self.lookup[book_data.order_id] = book_data
+
+    def __demote(self, side: OrderSide, price: int) -> None:
+        """Pack a hot level into the cold tier."""
+        dq = self.__get_books(side=side).pop(price)
+        for book_data in dq:
+            del self.lookup[book_data.order_id]
+        self.__get_cold(side=side).put_level(price, ColdLevel.pack(dq))
+
+    def __rebalance(self, side: OrderSide) -> None:
+        """Keep levels within cold_distance of the touch hot, pack those beyond twice that."""
+        if self.cold_distance is None:
+            return
+
+        books = self.__get_books(side=side)
+        cold = self.__get_cold(side=side)
+
+        # hot side emptied: the nearest cold level becomes the touch
+        if not books:
+            if not cold.levels:
+                return
+            self.__promote(side=side, price=cold.nearest())
+
+        touch = self.__touch(side=side)
+
+        # market moved toward cold levels
+        while cold.levels and self.__distance(side, cold.nearest(), touch) <= self.cold_distance:
+            self.__promote(side=side, price=cold.nearest())
+
+        # market moved away from hot levels
+        while len(books) > 1:
+            far = books.peekitem(0 if side == OrderSide.BUY else -1)[0]
+            if self.__distance(side, far, touch) <= 2 * self.cold_distance:
+                break
+            self.__demote(side=side, price=far)
+
+    def __get_cold(self, side: OrderSide) -> ColdTier:
+        """Get the cold tier of the given side."""
+        return self.cold_bids if side == OrderSide.BUY else self.cold_asks
+
+    def __get_depth(self, side: OrderSide) -> DepthIndex:
+        """Get the depth index of the given side."""
+        return self.bid_depth if side == OrderSide.BUY else self.ask_depth
 
     def __get_books(self, side: OrderSide) -> SortedDict[int, Deque[BookModel]]:
         """Get the correct book (bids or asks) by side."""
@@ -0,0 +1,31 @@
+from typing import Set, Tuple
+
+from common.enums.order import OrderSide
+
+
+class BookChanges:
+    """
+    Levels and orders of a book touched since the last sync.
+
+    Attached to an OrderBook by its reader (the query snapshots); books
+    without one record nothing. The reader consumes and clears it, so the
+    cost of catching up follows the flow since the last sync instead of
+    the size of the book.
+    """
+    __slots__ = ("levels", "orders")
+
+    def __init__(self):
+        self.levels: Set[Tuple[OrderSide, int]] = set()
+        self.orders: Set[str] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.levels or self.orders)
+
+    def mark(self, side: OrderSide, price: int, order_id: str) -> None:
+        """Record a change to an order resting at a level."""
+        self.levels.add((side, price))
+        self.orders.add(order_id)
+
+    def clear(self) -> None:
+        self.levels.clear()
+        self.orders.clear()
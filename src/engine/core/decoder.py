@@ -0,0 +1,99 @@
+import copyreg
+import json
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from loguru import logger
+
+from common.enums.order import OrderType, Symbol, OrderSide, OrderKind, TimeInForce
+from common.models.orders import BaseOrder, CreateOrder, AmendOrder, MassQuoteOrder, MassCancelOrder
+
+
+# order model for each message type
+ORDER_MODELS: Dict[str, Type[BaseOrder]] = {
+    OrderType.CREATE.value: CreateOrder,
+    OrderType.AMEND.value: AmendOrder,
+    OrderType.CANCEL.value: BaseOrder,
+    OrderType.MASS_QUOTE.value: MassQuoteOrder,
+    OrderType.MASS_CANCEL.value: MassCancelOrder,
+}
+
+# validated order as (message type, field values), what decode workers send back
+OrderRow = Tuple[str, Dict[str, Any]]
+
+
+def _enum_member(cls: Type[Enum], value: Any) -> Enum:
+    return cls._value2member_map_[value]
+
+
+def _reduce_enum(member: Enum):
+    return _enum_member, (type(member), member.value)
+
+
+# enum members unpickle through Enum.__call__ by default, several microseconds
+# each; a direct member lookup keeps unpickling a row well below validating it
+for _enum in (OrderType, Symbol, OrderSide, OrderKind, TimeInForce):
+    copyreg.pickle(_enum, _reduce_enum)
+
+
+def decode_order(data: bytes) -> Optional[BaseOrder]:
+    """
+    Decode and validate a raw order message.
+
+    Returns None for unknown message types, raises on malformed payloads.
+    Kept at module level so it can run in a process pool.
+    """
+    # decode and parse message data
+    payload = json.loads(data.decode())
+
+    # determine order type and validate
+    model = ORDER_MODELS.get(payload['type'])
+    if model is None:
+        logger.warning(f"Unexpected type is detected. skipping.")
+        return None
+
+    return model.model_validate(payload)
+
+
+def decode_row(data: bytes) -> Optional[OrderRow]:
+    """
+    Decode and validate a raw order message into its field values.
+
+    Worker side of the decode pipeline: a dict of validated values pickles
+    and unpickles cheaply, a pydantic model costs more to unpickle than
+    validating inline.
+    """
+    order = decode_order(data)
+    if order is None:
+        return None
+    return order.type.value, dict(order.__dict__)
+
+
+def build_order(row: OrderRow) -> BaseOrder:
+    """Rebuild an order validated by decode_row, without validating it again."""
+    kind, fields = row
+    model = ORDER_MODELS[kind]
+
+    # what model_construct does, minus its per-field default handling (every field is present)
+    order = model.__new__(model)
+    object.__setattr__(order, "__dict__", fields)
+    object.__setattr__(order, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(order, "__pydantic_extra__", None)
+    object.__setattr__(order, "__pydantic_private__", None)
+    return order
+
+
+def decode_batch(decode: Callable[[bytes], Any], batch: List[bytes]) -> List[Any]:
+    """
+    Decode a batch of messages in a worker, one result per message.
+
+    A failing message becomes its error text instead of failing the
+    whole batch.
+    """
+    results: List[Any] = []
+    for data in batch:
+        try:
+            results.append(decode(data))
+        except Exception as e:
+            results.append(f"{type(e).__name__}: {e}")
+    return results
@@ -0,0 +1,136 @@
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over string keys (double hashing on blake2b)."""
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.array[i >> 3] & (1 << (i & 7)) for i in self._positions(key))
+
+    def add(self, key: str) -> None:
+        for i in self._positions(key):
+            self.array[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+
+class DedupeFilter:
+    """
+    Bounded-memory duplicate detection keyed on (symbol, order_id, seq).
+
+    The latest `window` keys are kept in an exact set. Keys falling out of
+    the window go to a bloom filter; two bloom generations are kept, so
+    memory stays fixed and ids older than both are forgotten. A key whose
+    seq is above every evicted seq of its symbol cannot be in the filters,
+    so fresh flow never pays for (or is hit by) a false positive, whether
+    seq is global or counted per symbol.
+    """
+    def __init__(self, window: int = 100_000, bloom_capacity: int = 1_000_000, bloom_error_rate: float = 1e-6):
+        self.window = window
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+
+        # key -> (symbol, seq)
+        self.recent: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self.old_bloom: Optional[BloomFilter] = None
+
+        # highest seq evicted into the filters, per symbol
+        self.max_evicted_seq: Dict[str, int] = {}
+
+    def seen(self, symbol: str, order_id: str, seq: int) -> bool:
+        """Check a key and remember it. True means it was already processed."""
+        key = f"{symbol}|{order_id}|{seq}"
+        if key in self.recent:
+            return True
+
+        evicted = self.max_evicted_seq.get(symbol)
+        if evicted is not None and seq <= evicted:
+            if key in self.bloom or (self.old_bloom is not None and key in self.old_bloom):
+                return True
+
+        self.recent[key] = (symbol, seq)
+        if len(self.recent) > self.window:
+            self._evict()
+        return False
+
+    def _evict(self) -> None:
+        """Move the oldest exact key into the bloom filter."""
+        key, (symbol, seq) = self.recent.popitem(last=False)
+
+        # start a new generation once the current filter is at capacity
+        if self.bloom.is_full():
+            self.old_bloom = self.bloom
+            self.bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+
+        self.bloom.add(key)
+        self.max_evicted_seq[symbol] = max(self.max_evicted_seq.get(symbol, seq), seq)
+
+
+class SequenceTracker:
+    """
+    Sequence gap detection per stream (a symbol, or one global stream).
+
+    Missing ranges are remembered until the late messages arrive, at most
+    max_gaps per stream.
+    """
+    def __init__(self, max_gaps: int = 10_000):
+        self.max_gaps = max_gaps
+        self.last: Dict[str, int] = {}
+        self.gaps: Dict[str, List[Tuple[int, int]]] = {}
+
+    def observe(self, stream: str, seq: int) -> Optional[Tuple[int, int]]:
+        """Record a seq, return the missing range if it opens a new gap."""
+        last = self.last.get(stream)
+
+        if last is None or seq == last + 1:
+            self.last[stream] = seq
+            return None
+
+        if seq > last + 1:
+            gap = (last + 1, seq - 1)
+            gaps = self.gaps.setdefault(stream, [])
+            gaps.append(gap)
+            if len(gaps) > self.max_gaps:
+                gaps.pop(0)
+            self.last[stream] = seq
+            logger.warning(f"Sequence gap on {stream}: missing {gap[0]}..{gap[1]}")
+            return gap
+
+        # late message, close the gap it belongs to
+        self._fill(stream, seq)
+        return None
+
+    def missing(self, stream: str) -> List[Tuple[int, int]]:
+        """Open gaps of a stream, oldest first."""
+        return list(self.gaps.get(stream, []))
+
+    def _fill(self, stream: str, seq: int) -> None:
+        gaps = self.gaps.get(stream)
+        if not gaps:
+            return
+
+        for i, (start, end) in enumerate(gaps):
+            if start <= seq <= end:
+                parts = [(s, e) for s, e in ((start, seq - 1), (seq + 1, end)) if s <= e]
+                gaps[i:i + 1] = parts
+                return
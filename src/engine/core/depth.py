@@ -0,0 +1,63 @@
+from typing import Dict
+
+
+class DepthIndex:
+    """
+    Cumulative quantity index over price levels.
+
+    Sparse Fenwick tree keyed by price: point updates and prefix sums
+    both cost O(log P) where P is the highest price seen, and memory only
+    grows with the levels actually touched.
+    """
+    def __init__(self):
+        # fenwick node -> partial sum, nodes are price + 1 (1-based)
+        self.tree: Dict[int, int] = {}
+        self.size: int = 1
+        self.total: int = 0
+
+    def add(self, price: int, qty: int) -> None:
+        """Add qty (may be negative) to the level at price."""
+        if price < 0:
+            raise ValueError(f"price must be non-negative, got {price}")
+        if qty == 0:
+            return
+
+        node = price + 1
+
+        # grow the universe by doubling, the new root covers everything so far
+        while node > self.size:
+            self.size <<= 1
+            if self.total:
+                self.tree[self.size] = self.total
+
+        while node <= self.size:
+            value = self.tree.get(node, 0) + qty
+            if value:
+                self.tree[node] = value
+            else:
+                self.tree.pop(node, None)
+            node += node & -node
+
+        self.total += qty
+
+    def prefix(self, price: int) -> int:
+        """Total qty resting at prices <= price."""
+        if price < 0:
+            return 0
+
+        node = min(price + 1, self.size)
+        acc = 0
+        while node > 0:
+            acc += self.tree.get(node, 0)
+            node -= node & -node
+        return acc
+
+    def at_or_above(self, price: int) -> int:
+        """Total qty resting at prices >= price."""
+        return self.total - self.prefix(price - 1)
+
+    def clear(self) -> None:
+        """Drop all levels."""
+        self.tree.clear()
+        self.size = 1
+        self.total = 0
@@ -1,10 +1,13 @@
 import asyncio
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 
-from common.enums.order import Symbol, OrderSide, OrderType
-from common.models.orders import CreateOrder, BaseOrder, AmendOrder
+from loguru import logger
+
+from common.enums.order import Symbol, OrderSide, OrderType, TimeInForce, OrderKind, MatchingMode, SequenceScope
+from common.models.orders import CreateOrder, BaseOrder, AmendOrder, MassQuoteOrder, MassCancelOrder
 from common.models.trade import Trade
 from engine.core.booker import OrderBook
+from engine.core.dedupe import DedupeFilter, SequenceTracker
 
 
 class Matcher:
@@ -12,17 +15,45 @@ class Matcher:
         Matcher processes incoming orders and matches them within
         their respective order books.
     """
-    def __init__(self):
+    def __init__(self, modes: Optional[Dict[Symbol, MatchingMode]] = None,
+                 dedupe: Optional[DedupeFilter] = None, sequences: Optional[SequenceTracker] = None,
+                 seq_scope: SequenceScope = SequenceScope.GLOBAL, cold_distance: Optional[int] = None,
+                 book_factory: Optional[Callable[..., OrderBook]] = None):
         # store order books and symbol-specific locks
         self.books: Dict[Symbol, OrderBook] = {}
         self.locks: Dict[Symbol, asyncio.Lock] = {}
 
+        # per-symbol matching mode, continuous unless configured otherwise
+        self.modes: Dict[Symbol, MatchingMode] = modes or {}
+
+        # optional redelivery protection and gap detection
+        self.dedupe = dedupe
+        self.sequences = sequences
+        self.seq_scope = seq_scope
+
+        # far-from-touch levels beyond this many ticks are stored packed
+        self.cold_distance = cold_distance
+
+        # book implementation, OrderBook unless an alternative backend is plugged in
+        self.book_factory = book_factory or OrderBook
+
     def _get_book(self, symbol: Symbol) -> OrderBook:
         """Get or create an order book for the given symbol."""
         # create book and lock if not exist
-        book = self.books.setdefault(symbol, OrderBook(symbol))
+        if symbol not in self.books:
+            self.books[symbol] = self.book_factory(symbol, mode=self.modes.get(symbol, MatchingMode.CONTINUOUS),
+                                                   cold_distance=self.cold_distance)
         self.locks.setdefault(symbol, asyncio.Lock())
-        return book
+        return self.books[symbol]
+
+    def auction_symbols(self) -> List[Symbol]:
+        """Symbols running in call auction mode."""
+        return [symbol for symbol, mode in self.modes.items() if mode == MatchingMode.AUCTION]
+
+    async def uncross(self, symbol: Symbol) -> List[Trade]:
+        """Run one auction uncross for the given symbol."""
+        book = self._get_book(symbol)
+        return await self._with_lock(symbol=symbol, func=self._handle_uncross, book=book)
 
     async def _with_lock(self, symbol: Symbol, func, *args, **kwargs):
         """Run a function safely under async lock per symbol."""
@@ -32,6 +63,14 @@ class Matcher:
 
     async def handle_event(self, order: BaseOrder) -> Optional[List[Trade]]:
         """Handle an incoming order event (CREATE, AMEND, CANCEL)."""
+        # drop redelivered events, even if their order is no longer in the book
+        if self.dedupe and self.dedupe.seen(order.symbol, order.order_id, order.seq):
+            return []
+
+        if self.sequences:
+            stream = order.symbol.value if self.seq_scope == SequenceScope.SYMBOL else SequenceScope.GLOBAL.value
+            self.sequences.observe(stream, order.seq)
+
         # ensure book exists for given symbol
         book = self._get_book(order.symbol)
 
@@ -47,18 +86,119 @@ class Matcher:
         elif order.type == OrderType.CANCEL:
             await self._with_lock(symbol=order.symbol, func=self._handle_cancel, book=book, order=order)
 
+        elif order.type == OrderType.MASS_QUOTE:
+            assert isinstance(order, MassQuoteOrder)
+            return await self._with_lock(symbol=order.symbol, func=self._handle_mass_quote, book=book, order=order)
+
+        elif order.type == OrderType.MASS_CANCEL:
+            assert isinstance(order, MassCancelOrder)
+            await self._with_lock(symbol=order.symbol, func=self._handle_mass_cancel, book=book, order=order)
+
         return []
 
 
-    @staticmethod
-    async def _handle_create(book: OrderBook, order: CreateOrder):
+    @classmethod
+    async def _handle_create(cls, book: OrderBook, order: CreateOrder) -> List[Trade]:
         """
                 Process a new order and try to match it with the opposite side.
         """
-        trades: List[Trade] = []
-
         # skip if order already exists
         if book.is_active(order_id=order.order_id):
+            return []
+
+        # stop orders wait in the trigger index until the last trade price reaches them
+        if order.is_stop:
+            if not book.stops.is_triggered(order, last_price=book.last_price):
+                book.park_stop(order)
+                return []
+            order = cls._activate(stop=order, ts=order.ts, seq=order.seq)
+
+        trades = cls._match(book=book, order=order)
+        cls._fire_stops(book=book, trades=trades, ts=order.ts, seq=order.seq)
+        return trades
+
+    @classmethod
+    async def _handle_uncross(cls, book: OrderBook) -> List[Trade]:
+        """
+                Uncross an auction book at its equilibrium price in one pass.
+        """
+        trades: List[Trade] = []
+
+        equilibrium = book.equilibrium_price()
+        if not equilibrium:
+            return trades
+
+        price, volume = equilibrium
+
+        # walk both sides from the touch, every order reached trades at the uncross price
+        while volume > 0:
+            bid = book.get_best_bid()
+            ask = book.get_best_ask()
+            trade_qty = min(bid.qty, ask.qty, volume)
+
+            # the earlier order is the maker, the later one the taker
+            maker, taker = (bid, ask) if (bid.ts, bid.seq) <= (ask.ts, ask.seq) else (ask, bid)
+            trades.append(Trade(
+                ts=taker.ts,
+                seq=taker.seq,
+                symbol=book.symbol,
+                buy_order_id=bid.order_id,
+                sell_order_id=ask.order_id,
+                qty=trade_qty,
+                price=price,
+                maker_order_id=maker.order_id,
+                taker_side=taker.side
+            ))
+
+            volume -= trade_qty
+            book.reduce_qty(order_id=bid.order_id, qty=trade_qty)
+            book.reduce_qty(order_id=ask.order_id, qty=trade_qty)
+
+        cls._fire_stops(book=book, trades=trades, ts=trades[-1].ts, seq=trades[-1].seq)
+        return trades
+
+    @classmethod
+    def _fire_stops(cls, book: OrderBook, trades: List[Trade], ts: int, seq: int) -> None:
+        """
+                Activate stops fired by a trade batch, then by the trades of
+                those stops (cascade). New trades are appended to trades.
+        """
+        batch = trades
+        while batch:
+            book.last_price = batch[-1].price
+            prices = [t.price for t in batch]
+
+            batch = []
+            for stop in book.pop_triggered_stops(low=min(prices), high=max(prices)):
+                batch.extend(cls._match(book=book, order=cls._activate(stop=stop, ts=ts, seq=seq)))
+            trades.extend(batch)
+
+    @staticmethod
+    def _activate(stop: CreateOrder, ts: int, seq: int) -> CreateOrder:
+        """Turn a fired stop into a market/limit order timed at its trigger."""
+        kind = OrderKind.MARKET if stop.kind == OrderKind.STOP else OrderKind.LIMIT
+        return stop.model_copy(update={"kind": kind, "ts": ts, "seq": seq})
+
+    @staticmethod
+    def _match(book: OrderBook, order: CreateOrder) -> List[Trade]:
+        """
+                Sweep the opposite side with an active order and rest what is left.
+        """
+        trades: List[Trade] = []
+
+        # call auction: orders only accumulate, IOC/FOK/market (incl. fired stops) cannot wait for the uncross
+        if book.mode == MatchingMode.AUCTION:
+            if order.can_rest:
+                book.add_order(order=order)
+            else:
+                logger.warning(f"Rejected {order.kind}/{order.tif} order {order.order_id} on auction symbol "
+                               f"{order.symbol}: only GTC limit orders can wait for the uncross")
+            return trades
+
+        limit = order.limit_price
+
+        # FOK: fill completely or do nothing, decided before touching the book
+        if order.tif == TimeInForce.FOK and book.fillable_qty(side=order.side, price=limit) < order.qty:
             return trades
 
         # BUY side logic
@@ -67,7 +207,7 @@ class Matcher:
                 best_ask = book.get_best_ask()
 
                 # stop if no match or price too high
-                if not best_ask or best_ask.price > order.price or order.qty <= 0:
+                if not best_ask or (limit is not None and best_ask.price > limit) or order.qty <= 0:
                     break
 
                 # execute trade at best ask price
@@ -96,7 +236,7 @@ class Matcher:
                 best_bid = book.get_best_bid()
 
                 # stop if no match or price too low
-                if not best_bid or best_bid.price < order.price or order.qty <= 0:
+                if not best_bid or (limit is not None and best_bid.price < limit) or order.qty <= 0:
                     break
 
                 # execute trade at best bid price
@@ -119,8 +259,8 @@ class Matcher:
                 order.qty -= trade_qty
                 book.reduce_qty(order_id=best_bid.order_id, qty=trade_qty)
 
-        # if not fully matched, add remaining qty to book
-        if order.qty > 0:
+        # if not fully matched, add remaining qty to book (IOC and market remainders are dropped)
+        if order.qty > 0 and order.can_rest:
             book.add_order(order=order)
 
         return trades
@@ -135,4 +275,39 @@ class Matcher:
     async def _handle_cancel(book: OrderBook, order: BaseOrder) -> None:
         """Handle cancel event."""
         # remove order from order book
-        book.cancel_order(order.order_id)
\ No newline at end of file
+        book.cancel_order(order.order_id)
+
+    @classmethod
+    async def _handle_mass_quote(cls, book: OrderBook, order: MassQuoteOrder) -> List[Trade]:
+        """
+            Replace the owner's whole quote ladder in one step.
+        """
+        trades: List[Trade] = []
+
+        # pull every resting quote of the owner, its pending stops are not part of the ladder
+        book.mass_cancel(owner=order.owner, include_stops=False)
+
+        # then enter new levels, zero qty levels are just pulled
+        for quote in order.quotes:
+            if quote.qty <= 0:
+                continue
+
+            create = CreateOrder(
+                type=OrderType.CREATE,
+                ts=order.ts,
+                seq=order.seq,
+                symbol=order.symbol,
+                order_id=quote.order_id,
+                side=quote.side,
+                price=quote.price,
+                qty=quote.qty,
+                owner=order.owner
+            )
+            trades.extend(await cls._handle_create(book=book, order=create))
+
+        return trades
+
+    @staticmethod
+    async def _handle_mass_cancel(book: OrderBook, order: MassCancelOrder) -> None:
+        """Handle mass cancel by symbol, side or owner."""
+        book.mass_cancel(side=order.side, owner=order.owner)
@@ -0,0 +1,133 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from common.models.orders import BaseOrder
+from common.utils import runtime
+from engine.core.decoder import build_order, decode_batch, decode_row
+
+if TYPE_CHECKING:
+    from nats.aio.msg import Msg
+
+
+def worker_pool(workers: int, log_level: str = "INFO") -> ProcessPoolExecutor:
+    """
+    Process pool for decode workers.
+
+    Workers are spawned, not forked: a fork copies the queued log sink and
+    the trade writer without their threads, so worker log lines would be
+    queued forever (and forking a threaded process can deadlock). Each
+    worker logs straight to its inherited stderr instead.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=runtime.configure_logging, initargs=(log_level, False))
+
+
+class DecodePipeline:
+    """
+    Parallel decode/validate stage in front of the matcher.
+
+    Messages are decoded in a worker pool while the matcher keeps running
+    on the event loop. Messages arriving in the same loop iteration are
+    sent to a worker as one batch (up to batch_size), so the inter-process
+    cost is paid per batch instead of per message. Every batch gets a slot
+    in a FIFO reorder buffer; the drain task awaits the slots strictly in
+    that order, so the matcher sees orders exactly as they arrived no
+    matter which worker finishes first.
+
+    Workers return plain value tuples (decode_row) that the loop turns
+    back into orders without validating again (build): unpickling a
+    pydantic model costs the loop more than validating it inline.
+    """
+    def __init__(
+        self,
+        sink: Callable[["Msg", BaseOrder], Awaitable[None]],
+        workers: int,
+        max_in_flight: int = 1024,
+        executor: Optional[Executor] = None,
+        decode: Callable[[bytes], Any] = decode_row,
+        build: Callable[[Any], BaseOrder] = build_order,
+        batch_size: int = 256,
+        log_level: str = "INFO",
+    ):
+        self.sink = sink
+        self.decode = decode
+        self.build = build
+        self.batch_size = batch_size
+        self.executor: Executor = executor or worker_pool(workers, log_level)
+
+        # messages of the batch being collected, flushed at the end of the loop iteration
+        self.batch: List["Msg"] = []
+
+        # reorder buffer of batches; in_flight bounds messages, so a slow matcher pushes back on the subscriber
+        self.pending: asyncio.Queue[Tuple[List["Msg"], asyncio.Future]] = asyncio.Queue()
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.space = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start handing decoded orders to the sink."""
+        if self.task is None:
+            self.task = asyncio.create_task(self._drain())
+
+    async def submit(self, msg: "Msg") -> None:
+        """Queue a message for decoding, its slot follows every earlier message."""
+        while self.in_flight >= self.max_in_flight:
+            self.space.clear()
+            await self.space.wait()
+
+        self.in_flight += 1
+        if not self.batch:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self.batch.append(msg)
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    async def join(self) -> None:
+        """Wait until every submitted message reached the sink."""
+        self._flush()
+        await self.pending.join()
+
+    async def close(self) -> None:
+        """Flush pending messages, stop the drain task and the worker pool."""
+        if self.task is not None:
+            await self.join()
+            self.task.cancel()
+            self.task = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _flush(self) -> None:
+        """Send the collected batch to the pool and reserve its slot."""
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor, decode_batch, self.decode, [msg.data for msg in batch])
+        self.pending.put_nowait((batch, future))
+
+    async def _drain(self) -> None:
+        """Await decode results head first and pass them to the sink."""
+        while True:
+            batch, future = await self.pending.get()
+            try:
+                rows = await future
+            except Exception as e:
+                logger.error(f"Failed to decode batch. error : {e}")
+                rows = [None] * len(batch)
+
+            for msg, row in zip(batch, rows):
+                try:
+                    if isinstance(row, str):
+                        logger.error(f"Failed to process message. error : {row}")
+                    elif row is not None:
+                        await self.sink(msg, self.build(row))
+                except Exception as e:
+                    logger.error(f"Failed to process message. error : {e}")
+
+            self.in_flight -= len(batch)
+            self.space.set()
+            self.pending.task_done()
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING, Dict
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from common.enums.order import Symbol, OrderSide
+from common.enums.query import QueryType, OrderStatusType
+from common.models.query import (
+    BookQuery, BboResponse, DepthLevel, DepthResponse, OrderStatusResponse, QueryError,
+)
+from engine.core.matcher import Matcher
+from engine.core.snapshot import BookSnapshot
+
+if TYPE_CHECKING:
+    from common.broker.nats_broker import NATSBroker
+
+
+class QueryService:
+    """
+    Read-only book queries over NATS request-reply.
+
+    Queries are answered from BookSnapshots synced every
+    snapshot_interval_ms, so query load never touches the live books or
+    their locks. Answers are at most one interval stale. A sync only
+    re-reads what changed since the previous one, so keeping the
+    snapshots fresh costs the loop little even on deep books.
+    """
+    def __init__(self, matcher: Matcher, broker: "NATSBroker", subject: str, snapshot_interval_ms: int = 100):
+        self.matcher = matcher
+        self.broker = broker
+        self.subject = subject
+        self.interval = snapshot_interval_ms / 1000
+
+        # snapshot per symbol, captured once and synced incrementally after
+        self.snapshots: Dict[Symbol, BookSnapshot] = {}
+
+    def refresh(self) -> None:
+        """Sync every book that changed since its last refresh."""
+        for symbol, book in list(self.matcher.books.items()):
+            current = self.snapshots.get(symbol)
+            if current is None:
+                self.snapshots[symbol] = BookSnapshot.capture(book)
+            elif current.version != book.version:
+                current.sync(book)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Subscribe to the query subject and keep snapshots fresh."""
+        await self.broker.subscribe(self.subject, handler=self.on_request)
+        logger.info(f"Book query service listening on: {self.subject}")
+
+        while not stop_event.is_set():
+            self.refresh()
+            await asyncio.sleep(self.interval)
+
+    async def on_request(self, msg) -> None:
+        """Answer a single query message."""
+        try:
+            query = BookQuery.model_validate(json.loads(msg.data.decode()))
+            response = self.answer(query)
+        except (ValueError, ValidationError) as e:
+            response = QueryError(error=str(e))
+
+        if msg.reply:
+            await msg.respond(response.model_dump_json().encode())
+
+    def answer(self, query: BookQuery) -> BaseModel:
+        """Build the response for a query from the latest snapshot."""
+        snapshot = self.snapshots.get(query.symbol)
+        if snapshot is None:
+            return QueryError(error=f"no book for symbol {query.symbol}")
+
+        meta = dict(symbol=snapshot.symbol, snapshot_version=snapshot.version, snapshot_age_ms=snapshot.age_ms)
+
+        if query.type == QueryType.ORDER_STATUS:
+            if not query.order_id:
+                return QueryError(error="order_status query requires order_id")
+
+            entry = snapshot.orders.get(query.order_id)
+            if entry is None:
+                return OrderStatusResponse(**meta, order_id=query.order_id, status=OrderStatusType.NOT_FOUND)
+
+            status, side, price, qty = entry
+            return OrderStatusResponse(**meta, order_id=query.order_id, status=status, side=side, price=price, qty=qty)
+
+        if query.type == QueryType.BBO:
+            bid = snapshot.best(OrderSide.BUY) or (None, None, 0)
+            ask = snapshot.best(OrderSide.SELL) or (None, None, 0)
+            return BboResponse(**meta, bid_price=bid[0], bid_qty=bid[1], ask_price=ask[0], ask_qty=ask[1],
+                               last_price=snapshot.last_price)
+
+        # depth
+        return DepthResponse(
+            **meta,
+            bids=[DepthLevel(price=p, qty=q, orders=n) for p, q, n in snapshot.top(OrderSide.BUY, query.levels)],
+            asks=[DepthLevel(price=p, qty=q, orders=n) for p, q, n in snapshot.top(OrderSide.SELL, query.levels)],
+        )
@@ -0,0 +1,124 @@
+import importlib
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type
+
+from loguru import logger
+
+from common.enums.order import Symbol
+from common.models.orders import BaseOrder
+from common.models.trade import Trade
+from engine.core.booker import OrderBook
+from engine.core.matcher import Matcher
+
+# (price, order_id, qty) of the best order, None on an empty side
+Top = Optional[Tuple[int, str, int]]
+
+
+def load_book_class(path: str) -> Type[OrderBook]:
+    """Import a book implementation from a 'package.module:Class' path."""
+    module_name, sep, class_name = path.partition(":")
+    if not sep or not module_name or not class_name:
+        raise ValueError(f"invalid book class {path!r}, expected 'package.module:Class'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def top_of_book(book) -> Tuple[Top, Top]:
+    """Best bid and best ask of a book."""
+    tops = []
+    for best in (book.get_best_bid(), book.get_best_ask()):
+        tops.append(None if best is None else (best.price, best.order_id, best.qty))
+    return tops[0], tops[1]
+
+
+class Divergence:
+    """First event on which the candidate disagreed with the primary book."""
+    def __init__(self, index: int, symbol: Symbol, event: str, primary_trades: List[Trade],
+                 candidate_trades: List[Trade], primary_top: Tuple[Top, Top], candidate_top: Tuple[Top, Top],
+                 recent: List[str], error: Optional[str] = None):
+        self.index = index
+        self.symbol = symbol
+        self.event = event
+        self.primary_trades = primary_trades
+        self.candidate_trades = candidate_trades
+        self.primary_top = primary_top
+        self.candidate_top = candidate_top
+        self.recent = recent
+        self.error = error
+
+    def describe(self) -> str:
+        """Multi-line report with the events that led up to the divergence."""
+        lines = [f"Shadow book diverged at event #{self.index} ({self.symbol}): {self.event}"]
+        if self.error:
+            lines.append(f"  candidate raised: {self.error}")
+        if self.primary_trades != self.candidate_trades:
+            lines.append(f"  primary trades:   {[t.model_dump() for t in self.primary_trades]}")
+            lines.append(f"  candidate trades: {[t.model_dump() for t in self.candidate_trades]}")
+        lines.append(f"  primary bbo:   bid={self.primary_top[0]} ask={self.primary_top[1]}")
+        lines.append(f"  candidate bbo: bid={self.candidate_top[0]} ask={self.candidate_top[1]}")
+        lines.append(f"  last {len(self.recent)} events of {self.symbol}:")
+        lines.extend(f"    {line}" for line in self.recent)
+        return "\n".join(lines)
+
+
+class ShadowMatcher(Matcher):
+    """
+    Matcher that drives a candidate book backend on the same flow.
+
+    The primary books (this matcher) stay authoritative: their trades are
+    returned and published. Every event is replayed on a deep copy into
+    the candidate matcher, and trades plus the top of book are compared.
+    The first divergence is recorded and logged with the preceding events
+    of that symbol; the candidate is dropped afterwards since its state no
+    longer follows the primary.
+    """
+    def __init__(self, candidate: Matcher, history: int = 20, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.candidate: Optional[Matcher] = candidate
+        self.history = history
+        self.recent: Dict[Symbol, Deque[str]] = {}
+        self.events = 0
+        self.divergence: Optional[Divergence] = None
+
+    async def handle_event(self, order: BaseOrder) -> Optional[List[Trade]]:
+        """Handle an event on the primary books, then verify the candidate."""
+        if self.candidate is None:
+            return await super().handle_event(order)
+
+        # matching mutates orders (taker qty), keep the event as it arrived
+        event = order.model_dump_json()
+        shadow = order.model_copy(deep=True)
+        trades = await super().handle_event(order)
+        await self._verify(order.symbol, event, trades or [], self.candidate.handle_event(shadow))
+        return trades
+
+    async def uncross(self, symbol: Symbol) -> List[Trade]:
+        """Run an auction uncross on the primary books, then verify the candidate."""
+        trades = await super().uncross(symbol)
+
+        if self.candidate is not None:
+            await self._verify(symbol, "uncross", trades, self.candidate.uncross(symbol))
+        return trades
+
+    async def _verify(self, symbol: Symbol, event: str, trades: List[Trade], pending) -> None:
+        self.events += 1
+        error = None
+        try:
+            candidate_trades = await pending or []
+        except Exception as e:
+            candidate_trades, error = [], f"{type(e).__name__}: {e}"
+
+        recent = self.recent.setdefault(symbol, deque(maxlen=self.history))
+        recent.append(event)
+
+        primary_top = top_of_book(self._get_book(symbol))
+        candidate_top = (None, None) if error else top_of_book(self.candidate._get_book(symbol))
+        if error is None and trades == candidate_trades and primary_top == candidate_top:
+            return
+
+        self.divergence = Divergence(index=self.events, symbol=symbol, event=event, primary_trades=trades,
+                                     candidate_trades=candidate_trades, primary_top=primary_top,
+                                     candidate_top=candidate_top, recent=list(recent), error=error)
+        logger.error(self.divergence.describe())
+
+        # candidate state no longer follows the primary, stop comparing
+        self.candidate = None
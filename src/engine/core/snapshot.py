@@ -0,0 +1,134 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedDict
+
+from common.enums.order import Symbol, OrderSide
+from common.enums.query import OrderStatusType
+from engine.core.booker import OrderBook
+
+# (price, total qty, order count), best level first
+Level = Tuple[int, int, int]
+# (status, side, price, qty)
+OrderEntry = Tuple[OrderStatusType, OrderSide, Optional[int], int]
+
+
+class BookSnapshot:
+    """
+    Query-side view of an OrderBook, kept as per-level aggregates and a
+    per-order status map.
+
+    The first capture copies the book once and attaches a BookChanges
+    tracker to it; every later sync only re-reads the levels and orders
+    the book touched since, so its cost follows the flow of one interval
+    rather than the size of the book. A sync runs without awaiting, so
+    readers on the loop never see it half applied.
+    """
+    __slots__ = ("symbol", "version", "taken_at", "last_price", "bids", "asks", "orders")
+
+    def __init__(self, symbol: Symbol):
+        self.symbol = symbol
+        self.version = -1
+        self.taken_at = time.monotonic()
+        self.last_price: Optional[int] = None
+
+        # price -> (price, total qty, order count)
+        self.bids: SortedDict[int, Level] = SortedDict()
+        self.asks: SortedDict[int, Level] = SortedDict()
+        self.orders: Dict[str, OrderEntry] = {}
+
+    @classmethod
+    def capture(cls, book: OrderBook) -> "BookSnapshot":
+        """Copy the state of a book and start tracking its changes. Must run without awaiting in between."""
+        snapshot = cls(symbol=book.symbol)
+        book.track_changes().clear()
+
+        for order_id, book_data in book.lookup.items():
+            snapshot.orders[order_id] = (OrderStatusType.RESTING, book_data.side, book_data.price, book_data.qty)
+        for cold in (book.cold_bids, book.cold_asks):
+            for order_id, price, qty, _ in cold.orders():
+                snapshot.orders[order_id] = (OrderStatusType.RESTING, cold.side, price, qty)
+        for order_id, stop in book.stops.lookup.items():
+            snapshot.orders[order_id] = (OrderStatusType.PENDING_STOP, stop.side, stop.price, stop.qty)
+
+        # hot and packed levels merged
+        for side, levels in ((OrderSide.BUY, snapshot.bids), (OrderSide.SELL, snapshot.asks)):
+            hot, cold = (book.bids, book.cold_bids) if side == OrderSide.BUY else (book.asks, book.cold_asks)
+            for price in list(hot.keys()) + list(cold.levels.keys()):
+                levels[price] = cls._level(book, side, price)
+
+        snapshot._stamp(book)
+        return snapshot
+
+    def sync(self, book: OrderBook) -> None:
+        """Apply the changes recorded on the book since the last sync. Must run without awaiting in between."""
+        changes = book.track_changes()
+
+        for side, price in changes.levels:
+            levels = self.bids if side == OrderSide.BUY else self.asks
+            level = self._level(book, side, price)
+            if level is None:
+                levels.pop(price, None)
+            else:
+                levels[price] = level
+
+        for order_id in changes.orders:
+            entry = self._order(book, order_id)
+            if entry is None:
+                self.orders.pop(order_id, None)
+            else:
+                self.orders[order_id] = entry
+
+        changes.clear()
+        self._stamp(book)
+
+    def best(self, side: OrderSide) -> Optional[Level]:
+        """Best level of a side."""
+        levels = self.bids if side == OrderSide.BUY else self.asks
+        if not levels:
+            return None
+        return levels.peekitem(-1 if side == OrderSide.BUY else 0)[1]
+
+    def top(self, side: OrderSide, n: int) -> List[Level]:
+        """Up to n levels of a side, best first."""
+        if side == OrderSide.BUY:
+            return list(reversed(self.bids.values()[-n:]))
+        return list(self.asks.values()[:n])
+
+    @property
+    def age_ms(self) -> float:
+        """Milliseconds since the snapshot was last synced."""
+        return (time.monotonic() - self.taken_at) * 1000
+
+    def _stamp(self, book: OrderBook) -> None:
+        self.version = book.version
+        self.last_price = book.last_price
+        self.taken_at = time.monotonic()
+
+    @staticmethod
+    def _level(book: OrderBook, side: OrderSide, price: int) -> Optional[Level]:
+        """Aggregate of a level, hot or packed, None once it is gone."""
+        hot, cold = (book.bids, book.cold_bids) if side == OrderSide.BUY else (book.asks, book.cold_asks)
+        dq = hot.get(price)
+        if dq:
+            return price, sum(o.qty for o in dq), len(dq)
+        level = cold.levels.get(price)
+        if level:
+            return price, sum(level.qty), len(level)
+        return None
+
+    @staticmethod
+    def _order(book: OrderBook, order_id: str) -> Optional[OrderEntry]:
+        """Status of an order, None once it left the book."""
+        book_data = book.lookup.get(order_id)
+        if book_data is not None:
+            return OrderStatusType.RESTING, book_data.side, book_data.price, book_data.qty
+        for cold in (book.cold_bids, book.cold_asks):
+            packed = cold.get(order_id)
+            if packed is not None:
+                price, qty, _ = packed
+                return OrderStatusType.RESTING, cold.side, price, qty
+        stop = book.stops.lookup.get(order_id)
+        if stop is not None:
+            return OrderStatusType.PENDING_STOP, stop.side, stop.price, stop.qty
+        return None
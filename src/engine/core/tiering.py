@@ -0,0 +1,147 @@
+from array import array
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from sortedcontainers import SortedDict
+
+from common.enums.order import OrderSide
+from common.models.booker import BookModel
+
+
+class ColdLevel:
+    """
+    Packed orders of one far-from-touch price level.
+
+    Parallel arrays instead of one BookModel per order; order stays FIFO
+    by (ts, seq) like the hot levels.
+    """
+    __slots__ = ("order_ids", "owners", "ts", "seq", "qty")
+
+    def __init__(self):
+        self.order_ids: List[str] = []
+        self.owners: List[Optional[str]] = []
+        self.ts = array("q")
+        self.seq = array("q")
+        self.qty = array("q")
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    def add(self, order_id: str, ts: int, seq: int, qty: int, owner: Optional[str]) -> None:
+        """Insert an order keeping (ts, seq) order, appending is the common case."""
+        i = len(self.order_ids)
+        while i > 0 and (ts, seq) < (self.ts[i - 1], self.seq[i - 1]):
+            i -= 1
+
+        self.order_ids.insert(i, order_id)
+        self.owners.insert(i, owner)
+        self.ts.insert(i, ts)
+        self.seq.insert(i, seq)
+        self.qty.insert(i, qty)
+
+    def remove(self, order_id: str) -> Tuple[int, Optional[str]]:
+        """Remove an order, return its qty and owner."""
+        i = self.order_ids.index(order_id)
+        qty, owner = self.qty[i], self.owners[i]
+
+        del self.order_ids[i]
+        del self.owners[i]
+        del self.ts[i]
+        del self.seq[i]
+        del self.qty[i]
+        return qty, owner
+
+    def get(self, order_id: str) -> Tuple[int, Optional[str]]:
+        """Qty and owner of an order."""
+        i = self.order_ids.index(order_id)
+        return self.qty[i], self.owners[i]
+
+    @classmethod
+    def pack(cls, dq: Deque[BookModel]) -> "ColdLevel":
+        """Pack a hot level."""
+        level = cls()
+        for book_data in dq:
+            level.order_ids.append(book_data.order_id)
+            level.owners.append(book_data.owner)
+            level.ts.append(book_data.ts)
+            level.seq.append(book_data.seq)
+            level.qty.append(book_data.qty)
+        return level
+
+    def unpack(self, price: int, side: OrderSide) -> Deque[BookModel]:
+        """Rebuild the hot representation of the level."""
+        return deque(
+            BookModel(price=price, ts=ts, seq=seq, order_id=order_id, qty=qty, side=side, owner=owner)
+            for order_id, owner, ts, seq, qty in zip(self.order_ids, self.owners, self.ts, self.seq, self.qty)
+        )
+
+
+class ColdTier:
+    """Cold levels of one side of a book plus an order_id -> price index."""
+    def __init__(self, side: OrderSide):
+        self.side = side
+        self.levels: SortedDict[int, ColdLevel] = SortedDict()
+        self.prices: Dict[str, int] = {}
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.prices
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def add(self, price: int, order_id: str, ts: int, seq: int, qty: int, owner: Optional[str]) -> None:
+        """Add an order to its packed level."""
+        level = self.levels.get(price)
+        if level is None:
+            level = self.levels[price] = ColdLevel()
+        level.add(order_id, ts, seq, qty, owner)
+        self.prices[order_id] = price
+
+    def remove(self, order_id: str) -> Optional[Tuple[int, int, Optional[str]]]:
+        """Remove an order, return its price, qty and owner."""
+        price = self.prices.pop(order_id, None)
+        if price is None:
+            return None
+
+        level = self.levels[price]
+        qty, owner = level.remove(order_id)
+        if not level:
+            del self.levels[price]
+        return price, qty, owner
+
+    def get(self, order_id: str) -> Optional[Tuple[int, int, Optional[str]]]:
+        """Price, qty and owner of an order."""
+        price = self.prices.get(order_id)
+        if price is None:
+            return None
+        qty, owner = self.levels[price].get(order_id)
+        return price, qty, owner
+
+    def nearest(self) -> Optional[int]:
+        """Price of the cold level closest to the touch."""
+        if not self.levels:
+            return None
+        return self.levels.peekitem(-1 if self.side == OrderSide.BUY else 0)[0]
+
+    def pop_level(self, price: int) -> ColdLevel:
+        """Take a level out of the tier."""
+        level = self.levels.pop(price)
+        for order_id in level.order_ids:
+            del self.prices[order_id]
+        return level
+
+    def put_level(self, price: int, level: ColdLevel) -> None:
+        """Store a packed level."""
+        self.levels[price] = level
+        for order_id in level.order_ids:
+            self.prices[order_id] = price
+
+    def clear(self) -> None:
+        self.levels.clear()
+        self.prices.clear()
+
+    def orders(self) -> Iterator[Tuple[str, int, int, Optional[str]]]:
+        """Iterate (order_id, price, qty, owner) of all cold orders."""
+        for price, level in self.levels.items():
+            for order_id, qty, owner in zip(level.order_ids, level.qty, level.owners):
+                yield order_id, price, qty, owner
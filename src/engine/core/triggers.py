@@ -0,0 +1,117 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+from sortedcontainers import SortedDict
+
+from common.enums.order import OrderSide
+from common.models.orders import CreateOrder
+
+
+class TriggerIndex:
+    """
+    Pending stop orders of one symbol, keyed by trigger price.
+
+    Buy stops fire when a trade prints at or above their stop price,
+    sell stops when a trade prints at or below it. Triggered orders are
+    popped from the cheap end of each index, so activation costs
+    O(log n + k) for k triggered orders.
+    """
+    def __init__(self):
+        self.buy_stops: SortedDict[int, Deque[CreateOrder]] = SortedDict()
+        self.sell_stops: SortedDict[int, Deque[CreateOrder]] = SortedDict()
+
+        # lookup table for cancel by order_id
+        self.lookup: Dict[str, CreateOrder] = {}
+
+        # owner index (owner -> order ids) for owner scoped cancels
+        self.owners: Dict[str, Set[str]] = {}
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.lookup
+
+    def __len__(self) -> int:
+        return len(self.lookup)
+
+    def add(self, order: CreateOrder) -> None:
+        """Park a stop order until its trigger price trades."""
+        stops = self.__get_stops(side=order.side)
+        stops.setdefault(order.stop_price, deque()).append(order)
+        self.lookup[order.order_id] = order
+        if order.owner is not None:
+            self.owners.setdefault(order.owner, set()).add(order.order_id)
+
+    def cancel(self, order_id: str) -> Optional[CreateOrder]:
+        """Remove a pending stop order by ID."""
+        order = self.lookup.pop(order_id, None)
+        if not order:
+            return None
+        self.__unlink_owner(order)
+
+        stops = self.__get_stops(side=order.side)
+        dq = stops.get(order.stop_price)
+        if dq is not None:
+            dq.remove(order)
+            if not dq:
+                del stops[order.stop_price]
+
+        return order
+
+    def cancel_where(self, side: Optional[OrderSide] = None, owner: Optional[str] = None) -> List[str]:
+        """Cancel pending stops matching the given side and/or owner."""
+        # owner scoped: only that owner's stops, side scoped: only that side's index
+        if owner is not None:
+            candidates = [self.lookup[order_id] for order_id in self.owners.get(owner, ())]
+        elif side is not None:
+            candidates = [order for dq in self.__get_stops(side=side).values() for order in dq]
+        else:
+            candidates = list(self.lookup.values())
+
+        order_ids = [order.order_id for order in candidates if side is None or order.side == side]
+        for order_id in order_ids:
+            self.cancel(order_id)
+        return order_ids
+
+    def is_triggered(self, order: CreateOrder, last_price: Optional[int]) -> bool:
+        """Check if a stop order would fire at the given last trade price."""
+        if last_price is None:
+            return False
+        if order.side == OrderSide.BUY:
+            return last_price >= order.stop_price
+        return last_price <= order.stop_price
+
+    def pop_triggered(self, low: int, high: int) -> List[CreateOrder]:
+        """
+        Pop every stop fired by trades printed within [low, high],
+        in the order the stops were submitted.
+        """
+        triggered: List[CreateOrder] = []
+
+        # buy stops: lowest stop prices fire first
+        while self.buy_stops and self.buy_stops.peekitem(0)[0] <= high:
+            _, dq = self.buy_stops.popitem(0)
+            triggered.extend(dq)
+
+        # sell stops: highest stop prices fire first
+        while self.sell_stops and self.sell_stops.peekitem(-1)[0] >= low:
+            _, dq = self.sell_stops.popitem(-1)
+            triggered.extend(dq)
+
+        for order in triggered:
+            del self.lookup[order.order_id]
+            self.__unlink_owner(order)
+
+        triggered.sort(key=lambda o: (o.ts, o.seq))
+        return triggered
+
+    def __unlink_owner(self, order: CreateOrder) -> None:
+        if order.owner is None:
+            return
+        ids = self.owners.get(order.owner)
+        if ids is not None:
+            ids.discard(order.order_id)
+            if not ids:
+                del self.owners[order.owner]
+
+    def __get_stops(self, side: OrderSide) -> SortedDict[int, Deque[CreateOrder]]:
+        """Get the correct index (buy or sell stops) by side."""
+        return self.buy_stops if side == OrderSide.BUY else self.sell_stops
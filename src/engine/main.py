@@ -1,63 +1,179 @@
+import argparse
 import asyncio
-import json
+import os
 import signal
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from common.config.config import settings
-from common.broker.nats_broker import NATSBroker
-from common.enums.order import OrderType
-from common.models.orders import BaseOrder, CreateOrder, AmendOrder
+from common.config.config import add_config_args, configure, get_settings
+from common.models.orders import BaseOrder
 from common.models.trade import Trade
 from common.utils.file_manager import FileManager
+from common.utils.journal import TradeJournal
+from common.utils import runtime, tracing
+from engine.core.decoder import decode_order
+from engine.core.dedupe import DedupeFilter, SequenceTracker
 from engine.core.matcher import Matcher
+from engine.core.pipeline import DecodePipeline
+from engine.core.query import QueryService
+from engine.core.shadow import ShadowMatcher, load_book_class
+from engine.profiler import SamplingProfiler
 from loguru import logger
 
-async def handle_message(msg, matcher: Matcher, broker: NATSBroker, file_manager: FileManager) -> Optional[List[Trade]]:
+if TYPE_CHECKING:
+    # nats-py is only imported by main(), replay and worker processes reuse this module without it
+    from common.broker.nats_broker import NATSBroker
+    from common.models.config import Settings
+
+# where trades are persisted
+TradeSink = FileManager | TradeJournal | runtime.OffloadWriter
+
+# trade log lines, sampled by runtime.trade_log_every
+trade_log = runtime.LogSampler()
+
+
+async def handle_message(msg, matcher: Matcher, broker: "NATSBroker", file_manager: TradeSink) -> Optional[List[Trade]]:
     """Handle incoming NATS messages and process order events."""
     try:
-        # decode and parse message data
-        data = json.loads(msg.data.decode())
-        order_type = data['type']
-
-        # determine order type and validate
-        if order_type == OrderType.CREATE.value:
-            order = CreateOrder.model_validate(data)
-        elif order_type == OrderType.AMEND.value:
-            order = AmendOrder.model_validate(data)
-        elif order_type == OrderType.CANCEL.value:
-            order = BaseOrder.model_validate(data)
-        else:
-            logger.warning(f"Unexpected type is detected. skipping.")
+        # decode and validate message data
+        order = decode_order(msg.data)
+        if order is None:
             return None
 
-        # process order through matcher
-        trades = await matcher.handle_event(order=order)
-
-        # if trades are created, publish and log them
-        if trades:
-            for trade in trades:
-                trade_json = trade.model_dump_json()
-                logger.info(f"Trade is created. data: {trade_json}")
-                await broker.publish(subject=settings.nats.trades_subject, message=trade)
-                file_manager.write_json(trade.model_dump())
-        return trades
+        return await process_order(order, matcher, broker, file_manager, trace=tracing.trace_context(msg))
 
     except Exception as e:
         logger.error(f"Failed to process message. error : {e}")
         return None
 
 
+async def process_order(order: BaseOrder, matcher: Matcher, broker: "NATSBroker", file_manager: TradeSink,
+                        trace: Optional[dict] = None) -> List[Trade]:
+    """Match a decoded order and publish the resulting trades."""
+    # process order through matcher
+    trades = await matcher.handle_event(order=order)
+    if trace is not None:
+        trace[tracing.TRACE_MATCH] = str(tracing.now_ns())
+
+    # if trades are created, publish and log them
+    await publish_trades(trades, broker, file_manager, trace=trace)
+    return trades
+
+
+async def publish_trades(trades: Optional[List[Trade]], broker: "NATSBroker", file_manager: TradeSink,
+                         trace: Optional[dict] = None) -> None:
+    """Publish, log and persist matched trades."""
+    if not trades:
+        return
+
+    settings = get_settings()
+    for trade in trades:
+        # formatted only when sampled and INFO is enabled
+        if trade_log():
+            logger.opt(lazy=True).info("Trade is created. data: {}", trade.model_dump_json)
+
+        # traced orders carry their stamps over to each trade
+        headers = None
+        if trace is not None:
+            headers = {**trace, tracing.TRACE_TRADE_PUBLISH: str(tracing.now_ns())}
+
+        await broker.publish(subject=settings.nats.trades_subject, message=trade, headers=headers)
+        file_manager.write_json(trade.model_dump())
+
+
+async def run_auctions(matcher: Matcher, broker: "NATSBroker", file_manager: TradeSink, stop_event: asyncio.Event) -> None:
+    """Uncross every call auction symbol at each auction tick."""
+    interval = get_settings().engine.auction_interval_ms / 1000
+
+    while not stop_event.is_set():
+        await asyncio.sleep(interval)
+        for symbol in matcher.auction_symbols():
+            try:
+                trades = await matcher.uncross(symbol)
+                await publish_trades(trades, broker, file_manager)
+            except Exception as e:
+                logger.error(f"Auction uncross failed for {symbol}. error : {e}")
+
+
+def build_matcher(settings: "Settings") -> Matcher:
+    """Matcher from settings, shadowed by a candidate book backend when enabled."""
+    dedupe = settings.dedupe
+
+    def _dedupe() -> Optional[DedupeFilter]:
+        return DedupeFilter(dedupe.window, dedupe.bloom_capacity, dedupe.bloom_error_rate) if dedupe.enabled else None
+
+    options = dict(
+        modes=settings.engine.matching_modes,
+        dedupe=_dedupe(),
+        sequences=SequenceTracker() if dedupe.enabled else None,
+        seq_scope=dedupe.seq_scope,
+        cold_distance=settings.engine.cold_distance
+    )
+    if not settings.shadow.enabled:
+        return Matcher(**options)
+
+    # candidate sees the same flow, including its own redelivery filter
+    shadow = settings.shadow
+    candidate = Matcher(modes=settings.engine.matching_modes, dedupe=_dedupe(), cold_distance=shadow.cold_distance,
+                        book_factory=load_book_class(shadow.book_class))
+    logger.info(f"Shadow book enabled, candidate: {shadow.book_class} (cold_distance={shadow.cold_distance})")
+    return ShadowMatcher(candidate, history=shadow.history, **options)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse engine command line options."""
+    parser = argparse.ArgumentParser(description="Consume orders from NATS and match them.")
+    add_config_args(parser)
+    return parser.parse_args(argv)
+
+
 async def main():
     """Main entrypoint for the matching engine."""
+    settings = get_settings()
+    from common.broker.nats_broker import NATSBroker
+
     # initialize dependencies
-    file_manager = FileManager(settings.engine.output_path)
+    if settings.engine.journal_dir:
+        file_manager = TradeJournal(
+            settings.engine.journal_dir,
+            segment_max_bytes=settings.engine.journal_segment_max_bytes,
+            segment_max_age_s=settings.engine.journal_segment_max_age_s
+        )
+    else:
+        file_manager = FileManager(settings.engine.output_path)
+
+    # file writes leave the event loop, one writer thread keeps trade order
+    if settings.runtime.offload_file_io:
+        file_manager = runtime.OffloadWriter(file_manager, max_pending=settings.runtime.offload_queue_size,
+                                             overflow=settings.runtime.offload_overflow)
+    trade_log.every = settings.runtime.trade_log_every
     broker = NATSBroker(settings.nats)
     await broker.connect()
-    matcher = Matcher()
+    matcher = build_matcher(settings)
 
     # define message handler for incoming NATS events
-    async def on_message(msg):
-        await handle_message(msg, matcher, broker, file_manager)
+    pipeline = None
+    if settings.engine.decode_workers > 0:
+        # decode in a worker pool, match in arrival order on this loop
+        async def on_decoded(msg, order):
+            await process_order(order, matcher, broker, file_manager, trace=tracing.trace_context(msg))
+
+        pipeline = DecodePipeline(
+            sink=on_decoded,
+            workers=settings.engine.decode_workers,
+            max_in_flight=settings.engine.decode_max_in_flight,
+            batch_size=settings.engine.decode_batch_size,
+            log_level=settings.runtime.log_level
+        )
+        pipeline.start()
+        logger.info(f"Decode pipeline started with {settings.engine.decode_workers} workers")
+
+        async def on_message(msg):
+            tracing.mark_received(msg)
+            await pipeline.submit(msg)
+    else:
+        async def on_message(msg):
+            tracing.mark_received(msg)
+            await handle_message(msg, matcher, broker, file_manager)
 
     # subscribe to orders subject
     await broker.subscribe(settings.nats.orders_subject, handler=on_message)
@@ -74,15 +190,54 @@ async def main():
     for sig in (signal.SIGINT, signal.SIGTERM):
         asyncio.get_event_loop().add_signal_handler(sig, lambda s=sig: _signal_handler())
 
+    # on-demand sampling profile, written next to the trade journal
+    if settings.profiler.enabled:
+        profile_dir = settings.engine.journal_dir or os.path.dirname(settings.engine.output_path or "") or "."
+        profiler = SamplingProfiler(profile_dir, interval_ms=settings.profiler.interval_ms,
+                                    default_duration_s=settings.profiler.default_duration_s,
+                                    max_duration_s=settings.profiler.max_duration_s)
+        asyncio.get_event_loop().add_signal_handler(signal.SIGUSR1, profiler.start)
+        await broker.subscribe(settings.nats.control_subject, handler=profiler.on_request)
+        logger.info(f"Profiler ready: SIGUSR1 or {settings.nats.control_subject}, output: {profile_dir}")
+
+    # periodic uncross for call auction symbols
+    auction_task = None
+    if matcher.auction_symbols():
+        auction_task = asyncio.create_task(run_auctions(matcher, broker, file_manager, stop_event))
+        logger.info(f"Call auction symbols: {matcher.auction_symbols()}")
+
+    # read-only book queries served from snapshots
+    query_task = None
+    if settings.query.enabled:
+        query_service = QueryService(matcher, broker, subject=settings.nats.query_subject,
+                                     snapshot_interval_ms=settings.query.snapshot_interval_ms)
+        query_task = asyncio.create_task(query_service.run(stop_event))
+
     # wait until stop signal is triggered
     await stop_event.wait()
 
-    # cleanup connections
+    for task in (auction_task, query_task):
+        if task:
+            task.cancel()
+
+    # drain decoded orders while the broker can still publish their trades, then close it
+    if pipeline:
+        await pipeline.close()
     await broker.close()
+    if isinstance(file_manager, (TradeJournal, runtime.OffloadWriter)):
+        file_manager.close()
     logger.info("NATS connection closed.")
 
 
+def start(argv: Optional[List[str]] = None) -> None:
+    """Load settings, set up logging and run the engine on the configured event loop."""
+    args = parse_args(argv)
+    settings = configure(args.settings, args.overrides)
+    runtime.configure_logging(settings.runtime.log_level, enqueue=settings.runtime.log_enqueue,
+                              queue_size=settings.runtime.log_queue_size)
+    runtime.run(main(), settings.runtime.event_loop)
+
 
 if __name__ == '__main__':
     # run event loop
-    asyncio.run(main())
\ No newline at end of file
+    start()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import json
+import math
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+from loguru import logger
+
+
+class SamplingProfiler:
+    """
+    On-demand wall-clock sampling profiler for the running engine.
+
+    A daemon thread reads the target thread's current stack through
+    sys._current_frames every interval and counts collapsed stacks. The
+    event loop is never stopped; each sample only costs a GIL hand-off.
+    Output is one "frame;frame;frame count" line per stack (root first),
+    readable by flamegraph.pl, speedscope or inferno. A running profile
+    can be stopped early, what was sampled so far is still written.
+    """
+    def __init__(self, output_dir: str, interval_ms: float = 5, default_duration_s: float = 30,
+                 max_duration_s: float = 300, thread_id: Optional[int] = None):
+        self.output_dir = Path(output_dir).resolve()
+        self.interval = interval_ms / 1000
+        self.max_duration_s = max_duration_s
+        self.default_duration_s = self.check_duration(default_duration_s)
+        # profile the thread that creates the profiler (the event loop) by default
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def check_duration(self, duration_s) -> float:
+        """Validate a requested duration: a positive number of seconds up to max_duration_s."""
+        if isinstance(duration_s, bool) or not isinstance(duration_s, (int, float)) or not math.isfinite(duration_s):
+            raise ValueError(f"duration_s must be a number, got {duration_s!r}")
+        if not 0 < duration_s <= self.max_duration_s:
+            raise ValueError(f"duration_s must be within (0, {self.max_duration_s:g}], got {duration_s:g}")
+        return float(duration_s)
+
+    def start(self, duration_s: Optional[float] = None) -> Optional[Path]:
+        """Start a profile in the background, return its output path or None if one is running."""
+        duration_s = self.default_duration_s if duration_s is None else self.check_duration(duration_s)
+        if self.active:
+            logger.warning("Profiler is already running, request ignored.")
+            return None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, args=(duration_s, path), name="sampling-profiler",
+                                       daemon=True)
+        self.thread.start()
+        logger.info(f"Profiling for {duration_s}s, output: {path}")
+        return path
+
+    def stop(self) -> bool:
+        """Stop a running profile early, its samples are still written. False if none is running."""
+        if not self.active:
+            return False
+        self.stop_event.set()
+        return True
+
+    async def on_request(self, msg) -> None:
+        """
+        Control message: {"duration_s": N} starts a profile, an empty body
+        uses the default duration; {"action": "stop"} ends a running one.
+        """
+        try:
+            body = json.loads(msg.data.decode()) if msg.data else {}
+            if body.get("action") == "stop":
+                response = {"stopped": self.stop()}
+            else:
+                path = self.start(body.get("duration_s"))
+                response = {"started": path is not None, "path": str(path) if path else None}
+        except (ValueError, AttributeError, TypeError) as e:
+            response = {"started": False, "error": str(e)}
+
+        if msg.reply:
+            await msg.respond(json.dumps(response).encode())
+
+    def _run(self, duration_s: float, path: Path) -> None:
+        """Sample until the deadline, then write collapsed stacks."""
+        stacks: Counter[str] = Counter()
+        deadline = time.monotonic() + duration_s
+
+        while time.monotonic() < deadline and not self.stop_event.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stacks[self.collapse(frame)] += 1
+            del frame
+            self.stop_event.wait(self.interval)
+
+        try:
+            with path.open("w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            logger.info(f"Profile written: {path} ({sum(stacks.values())} samples)")
+        except Exception as e:
+            logger.error(f"Failed to write profile {path}: {e}")
+
+    @staticmethod
+    def collapse(frame: Optional[FrameType]) -> str:
+        """Collapse a stack into 'root;...;leaf' frames."""
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{Path(code.co_filename).stem}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ";".join(reversed(frames))
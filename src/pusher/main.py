@@ -1,13 +1,20 @@
+import argparse
 import asyncio
 import signal
+from typing import TYPE_CHECKING, List, Optional
+
 from loguru import logger
 
-from common.config.config import settings
-from common.broker.nats_broker import NATSBroker
+from common.config.config import add_config_args, configure, get_settings
 from common.utils.file_manager import FileManager
+from common.utils import runtime, tracing
+from pusher.parallel import publish_parallel
+
+if TYPE_CHECKING:
+    from common.broker.nats_broker import NATSBroker
 
 
-async def publish_orders(broker: NATSBroker, file_manager: FileManager):
+async def publish_orders(broker: "NATSBroker", file_manager: FileManager, trace: bool = False, delay: float = 0.2):
     """Read orders from file and publish them to NATS."""
     # load orders from local file
     orders = file_manager.read_json()
@@ -17,21 +24,52 @@ async def publish_orders(broker: NATSBroker, file_manager: FileManager):
         return
 
     logger.info(f"Loaded {len(orders)} orders from file.")
+    subject = get_settings().nats.orders_subject
 
     # iterate through all orders and publish one by one
     for idx, order in enumerate(orders, start=1):
         try:
-            await broker.publish(subject=settings.nats.orders_subject, message=order)
+            headers = tracing.publish_headers() if trace else None
+            await broker.publish(subject=subject, message=order, headers=headers)
             logger.info(f"[{idx}] Published order: {order}")
         except Exception as e:
             logger.error(f"Failed to publish order #{idx}: {e}")
 
         # small delay between messages to avoid flooding
-        await asyncio.sleep(0.2)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def watch_trades(broker: "NATSBroker", recorder: tracing.LatencyRecorder):
+    """Subscribe to trades and record order-to-trade latency of traced trades."""
+    async def on_trade(msg):
+        received_ns = tracing.now_ns()
+        if msg.headers and tracing.TRACE_PUBLISH in msg.headers:
+            recorder.record(tracing.stage_latencies(msg.headers, received_ns))
+
+    await broker.subscribe(get_settings().nats.trades_subject, handler=on_trade)
+
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse pusher command line options."""
+    parser = argparse.ArgumentParser(description="Publish orders from file to NATS.")
+    add_config_args(parser)
+    parser.add_argument("--latency", action="store_true",
+                        help="trace published orders and report order-to-trade latency percentiles")
+    parser.add_argument("--latency-wait", type=float, default=2.0,
+                        help="seconds to wait for trailing trades before reporting latency")
+    parser.add_argument("--connections", type=int, default=1,
+                        help="publish symbols concurrently over this many connections (order kept per symbol)")
+    parser.add_argument("--delay", type=float, default=0.2,
+                        help="seconds to sleep after each order, per symbol stream when parallel (0 disables)")
+    return parser.parse_args(argv)
 
-async def main():
+
+async def main(args: argparse.Namespace):
     """Main entrypoint for the order pusher."""
+    settings = get_settings()
+    from common.broker.nats_broker import NATSBroker
+
     # setup file manager and NATS broker
     file_manager = FileManager(settings.engine.input_path)
     broker = NATSBroker(settings.nats)
@@ -50,10 +88,35 @@ async def main():
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, lambda s=sig: asyncio.create_task(shutdown()))
 
+    # latency mode listens for the trades of the orders it publishes
+    recorder = None
+    if args.latency:
+        recorder = tracing.LatencyRecorder()
+        await watch_trades(broker, recorder)
+
+    trace = args.latency or settings.tracing.enabled
     try:
-        # publish all orders sequentially
-        await publish_orders(broker, file_manager)
+        if args.connections > 1:
+            # one stream per symbol, spread over extra connections
+            extra = [NATSBroker(settings.nats) for _ in range(args.connections - 1)]
+            try:
+                for conn in extra:
+                    await conn.connect()
+                stats = await publish_parallel([broker, *extra], file_manager.read_json(),
+                                               subject=settings.nats.orders_subject, delay=args.delay, trace=trace)
+            finally:
+                for conn in extra:
+                    await conn.close()
+            stats.report()
+        else:
+            # publish all orders sequentially
+            await publish_orders(broker, file_manager, trace=trace, delay=args.delay)
         logger.info("All orders published successfully.")
+
+        if recorder:
+            await asyncio.sleep(args.latency_wait)
+            recorder.report()
+            stop_event.set()
     except asyncio.CancelledError:
         logger.warning("Publishing interrupted by cancel request.")
     finally:
@@ -64,9 +127,18 @@ async def main():
     await stop_event.wait()
 
 
+def start(argv: Optional[List[str]] = None) -> None:
+    """Load settings, set up logging and run the pusher on the configured event loop."""
+    args = parse_args(argv)
+    settings = configure(args.settings, args.overrides)
+    runtime.configure_logging(settings.runtime.log_level, enqueue=settings.runtime.log_enqueue,
+                              queue_size=settings.runtime.log_queue_size)
+    runtime.run(main(args), settings.runtime.event_loop)
+
+
 if __name__ == "__main__":
     try:
         # run event loop
-        asyncio.run(main())
+        start()
     except KeyboardInterrupt:
         logger.warning("Interrupted manually. Exiting.")
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+from loguru import logger
+
+from common.utils import tracing
+
+if TYPE_CHECKING:
+    from common.broker.base import BaseBroker
+
+
+def split_by_symbol(orders: List[dict]) -> Dict[str, List[dict]]:
+    """Split the input into one stream per symbol, keeping file order inside each."""
+    streams: Dict[str, List[dict]] = {}
+    for order in orders:
+        streams.setdefault(order.get("symbol"), []).append(order)
+    return streams
+
+
+def assign_streams(streams: Dict[str, List[dict]], connections: int) -> List[List[str]]:
+    """Spread symbols over connections, largest stream first onto the least loaded one."""
+    slots: List[List[str]] = [[] for _ in range(max(1, connections))]
+    loads = [0] * len(slots)
+    for symbol in sorted(streams, key=lambda s: len(streams[s]), reverse=True):
+        i = loads.index(min(loads))
+        slots[i].append(symbol)
+        loads[i] += len(streams[symbol])
+    return slots
+
+
+class PublishStats:
+    """
+    Publish counts and rates, aggregate and per symbol.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = self.started
+        self.counts: Dict[str, int] = {}
+        self.elapsed: Dict[str, float] = {}
+        self.errors = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def rates(self) -> Dict[str, float]:
+        """Orders per second, 'all' over the wall time of the run, symbols over their own stream."""
+        wall = self.finished - self.started
+        rates = {"all": self.total / wall if wall > 0 else 0.0}
+        for symbol, count in self.counts.items():
+            elapsed = self.elapsed.get(symbol, 0)
+            rates[symbol] = count / elapsed if elapsed > 0 else 0.0
+        return rates
+
+    def report(self) -> None:
+        """Log the publish rates."""
+        rates = self.rates()
+        logger.info(f"Published {self.total} orders in {self.finished - self.started:.3f}s "
+                    f"({rates.pop('all'):.0f} orders/s, {self.errors} errors)")
+        for symbol, rate in sorted(rates.items()):
+            logger.info(f"  {symbol}: {self.counts[symbol]} orders, {rate:.0f} orders/s")
+
+
+async def publish_stream(broker: "BaseBroker", subject: str, symbol: str, orders: List[dict], stats: PublishStats,
+                         delay: float = 0, trace: bool = False) -> None:
+    """Publish one symbol's orders in order over one connection."""
+    start = time.perf_counter()
+    published = 0
+    for order in orders:
+        try:
+            headers = tracing.publish_headers() if trace else None
+            await broker.publish(subject=subject, message=order, headers=headers)
+            published += 1
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Failed to publish {symbol} order {order.get('order_id')}: {e}")
+
+        if delay:
+            await asyncio.sleep(delay)
+
+    stats.counts[symbol] = published
+    stats.elapsed[symbol] = time.perf_counter() - start
+
+
+async def publish_parallel(brokers: Sequence["BaseBroker"], orders: List[dict], subject: str,
+                           delay: float = 0, trace: bool = False) -> PublishStats:
+    """
+    Publish orders over several connections at once.
+
+    Every symbol is pinned to one connection and published by a single
+    task, so orders of a symbol reach the engine in file order while
+    different symbols go out concurrently. Orders of different symbols may
+    interleave differently than in the file.
+    """
+    streams = split_by_symbol(orders)
+    slots = assign_streams(streams, len(brokers))
+    stats = PublishStats()
+
+    tasks = [
+        publish_stream(broker, subject, symbol, streams[symbol], stats, delay=delay, trace=trace)
+        for broker, symbols in zip(brokers, slots)
+        for symbol in symbols
+    ]
+    await asyncio.gather(*tasks)
+
+    stats.finished = time.perf_counter()
+    return stats
@@ -0,0 +1,29 @@
+import pytest
+
+from engine.bench.memory import check_budgets, profile
+
+
+@pytest.mark.asyncio
+async def test_profile_reports_all_metrics():
+    metrics = await profile(orders=200, levels=10, flow=50)
+
+    assert set(metrics) == {"bytes_per_order", "bytes_per_level", "blocks_per_create", "blocks_per_cancel",
+                            "blocks_per_fill", "peak_bytes_per_fill", "peak_rss_mb"}
+    assert metrics["bytes_per_order"] > 0
+    assert metrics["bytes_per_level"] > 0
+
+
+@pytest.mark.asyncio
+async def test_profile_fills_every_taker_when_flow_exceeds_orders():
+    # order ids of the phases used to collide once flow * 2 > 10 * orders, skipping every taker
+    metrics = await profile(orders=20, levels=5, flow=300)
+
+    assert metrics["peak_bytes_per_fill"] > 0
+
+
+def test_budgets_fail_only_when_exceeded():
+    metrics = {"bytes_per_order": 1200.0, "peak_rss_mb": 80.0}
+
+    assert check_budgets(metrics, {"max_bytes_per_order": 1500, "max_rss_mb": None}) == []
+    failures = check_budgets(metrics, {"max_bytes_per_order": 1000})
+    assert len(failures) == 1 and failures[0].startswith("bytes_per_order")
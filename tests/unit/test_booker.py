@@ -123,3 +123,55 @@ def test_insert_multiple_bids_price_time_priority(order_book):
 
     dq = order_book.bids[100]
     assert [o.order_id for o in dq] == ["B1", "B3"]
+
+
+def test_mass_cancel_by_owner_uses_owner_index(order_book):
+    o1 = CreateOrder(type=OrderType.CREATE, ts=1000, seq=1, symbol=Symbol.ABC,
+                     side=OrderSide.BUY, order_id="B1", price=100, qty=5, owner="MM1")
+    o2 = CreateOrder(type=OrderType.CREATE, ts=1001, seq=2, symbol=Symbol.ABC,
+                     side=OrderSide.SELL, order_id="S1", price=102, qty=5, owner="MM1")
+    o3 = CreateOrder(type=OrderType.CREATE, ts=1002, seq=3, symbol=Symbol.ABC,
+                     side=OrderSide.BUY, order_id="B2", price=100, qty=5, owner="MM2")
+
+    order_book.add_order(o1)
+    order_book.add_order(o2)
+    order_book.add_order(o3)
+
+    cancelled = order_book.mass_cancel(owner="MM1", side=OrderSide.BUY)
+    assert cancelled == ["B1"]
+    assert order_book.is_active("S1")
+    assert order_book.owners["MM1"] == {"S1"}
+
+    order_book.mass_cancel(owner="MM1")
+    assert "MM1" not in order_book.owners
+    assert order_book.get_best_ask() is None
+    assert order_book.get_best_bid().order_id == "B2"
+
+
+def test_mass_cancel_whole_side(order_book, sample_buy_order, sample_sell_order):
+    order_book.add_order(sample_buy_order)
+    order_book.add_order(sample_sell_order)
+
+    cancelled = order_book.mass_cancel(side=OrderSide.BUY)
+
+    assert cancelled == ["B1"]
+    assert not order_book.bids
+    assert order_book.is_active("S1")
+
+
+def test_fillable_qty_tracks_book_changes(order_book):
+    for i, (price, qty) in enumerate([(101, 5), (102, 3), (104, 4)], start=1):
+        order_book.add_order(CreateOrder(type=OrderType.CREATE, ts=1000 + i, seq=i, symbol=Symbol.ABC,
+                                         side=OrderSide.SELL, order_id=f"S{i}", price=price, qty=qty))
+
+    assert order_book.fillable_qty(OrderSide.BUY, 102) == 8
+    assert order_book.fillable_qty(OrderSide.BUY) == 12
+
+    order_book.reduce_qty("S1", 2)
+    order_book.cancel_order("S2")
+    assert order_book.fillable_qty(OrderSide.BUY, 102) == 3
+
+    amend = AmendOrder(type=OrderType.AMEND, ts=1010, seq=10, symbol=Symbol.ABC, order_id="S3", price=101, qty=1)
+    order_book.amend_order(amend)
+    assert order_book.fillable_qty(OrderSide.BUY, 102) == 4
+    assert order_book.fillable_qty(OrderSide.SELL, 100) == 0
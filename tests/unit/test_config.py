@@ -0,0 +1,62 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from common.config import config
+
+SETTINGS = """
+nats:
+  url: "nats://localhost:4222"
+engine:
+  decode_workers: 0
+  matching_modes: {}
+"""
+
+
+@pytest.fixture
+def settings_file(tmp_path) -> Path:
+    path = tmp_path / "settings.yaml"
+    path.write_text(SETTINGS)
+    return path
+
+
+def test_overrides_env_then_cli(settings_file):
+    env = {
+        config.SETTINGS_PATH_ENV: str(settings_file),
+        "MME__ENGINE__DECODE_WORKERS": "2",
+        "MME__NATS__URL": "nats://env:4222",
+        "MME__DEDUPE__ENABLED": "true",
+    }
+    settings = config.load_settings(overrides=["engine.decode_workers=4", "engine.matching_modes={ABC: auction}"],
+                                    env=env)
+
+    assert settings.nats.url == "nats://env:4222"
+    assert settings.engine.decode_workers == 4
+    assert settings.engine.matching_modes == {"ABC": "auction"}
+    assert settings.dedupe.enabled is True
+
+    with pytest.raises(ValueError):
+        config.parse_override("engine.decode_workers")
+
+
+def test_settings_loaded_lazily_and_cached(settings_file, monkeypatch):
+    monkeypatch.setenv(config.SETTINGS_PATH_ENV, str(settings_file))
+    config.reset_settings()
+    try:
+        assert config._settings is None
+        settings = config.settings
+        assert settings is config.get_settings()
+        assert config.configure(overrides=["engine.decode_workers=3"]).engine.decode_workers == 3
+        assert config.get_settings().engine.decode_workers == 3
+    finally:
+        config.reset_settings()
+
+
+def test_entry_points_import_without_loading_config():
+    src = Path(__file__).resolve().parents[2] / "src"
+    code = ("import sys, engine.main, pusher.main; "
+            "print(sorted(m for m in ('yaml', 'nats') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,78 @@
+import pytest
+
+from common.enums.order import Symbol, OrderSide, OrderType
+from common.models.orders import CreateOrder
+from engine.core.dedupe import BloomFilter, DedupeFilter, SequenceTracker
+from engine.core.matcher import Matcher
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=1e-4)
+    for i in range(1000):
+        bloom.add(f"k{i}")
+
+    assert all(f"k{i}" in bloom for i in range(1000))
+    assert sum(f"x{i}" in bloom for i in range(1000)) <= 2
+
+
+def test_dedupe_window_then_bloom():
+    dedupe = DedupeFilter(window=2, bloom_capacity=100, bloom_error_rate=1e-6)
+
+    assert not dedupe.seen("ABC", "B1", 1)
+    assert not dedupe.seen("ABC", "B2", 2)
+    assert not dedupe.seen("ABC", "B3", 3)
+    assert len(dedupe.recent) == 2
+
+    # B1 was evicted from the exact window but is still caught
+    assert dedupe.seen("ABC", "B1", 1)
+    assert dedupe.seen("ABC", "B3", 3)
+    assert not dedupe.seen("XYZ", "B1", 1)
+
+
+def test_fresh_keys_skip_the_bloom_per_symbol():
+    dedupe = DedupeFilter(window=2, bloom_capacity=100, bloom_error_rate=1e-6)
+
+    # per-symbol seq: XYZ runs far ahead of ABC and gets evicted
+    for seq in range(1000, 1004):
+        assert not dedupe.seen("XYZ", f"X{seq}", seq)
+    assert dedupe.max_evicted_seq == {"XYZ": 1001}
+
+    # a saturated filter answers yes to everything, i.e. a false positive
+    dedupe.bloom.array = bytearray(b"\xff" * len(dedupe.bloom.array))
+
+    # fresh ABC keys are below XYZ's evicted seq but never consult the filter
+    assert not dedupe.seen("ABC", "A1", 5)
+    assert not dedupe.seen("ABC", "A2", 6)
+    assert dedupe.seen("XYZ", "X1000", 1000)
+
+
+def test_sequence_gaps_open_and_close():
+    tracker = SequenceTracker()
+
+    assert tracker.observe("ABC", 1) is None
+    assert tracker.observe("ABC", 5) == (2, 4)
+    assert tracker.observe("XYZ", 7) is None
+
+    tracker.observe("ABC", 3)
+    assert tracker.missing("ABC") == [(2, 2), (4, 4)]
+
+    tracker.observe("ABC", 2)
+    tracker.observe("ABC", 4)
+    assert tracker.missing("ABC") == []
+
+
+@pytest.mark.asyncio
+async def test_redelivered_filled_order_is_not_matched_again():
+    matcher = Matcher(dedupe=DedupeFilter(window=10))
+
+    sell = CreateOrder(type=OrderType.CREATE, ts=1000, seq=1, symbol=Symbol.ABC, side=OrderSide.SELL,
+                       order_id="S1", price=100, qty=10)
+    buy = CreateOrder(type=OrderType.CREATE, ts=1001, seq=2, symbol=Symbol.ABC, side=OrderSide.BUY,
+                      order_id="B1", price=100, qty=4)
+    await matcher.handle_event(sell)
+    assert len(await matcher.handle_event(buy)) == 1
+
+    # B1 is fully filled and gone from the book, redelivery must not trade again
+    redelivered = buy.model_copy(update={"qty": 4})
+    assert await matcher.handle_event(redelivered) == []
+    assert matcher.books[Symbol.ABC].get_best_ask().qty == 6
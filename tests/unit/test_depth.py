@@ -0,0 +1,49 @@
+import pytest
+from pydantic import ValidationError
+
+from common.enums.order import OrderSide, OrderType, Symbol
+from common.models.orders import AmendOrder, CreateOrder
+from engine.core.depth import DepthIndex
+
+
+def test_prefix_and_at_or_above():
+    depth = DepthIndex()
+    depth.add(100, 5)
+    depth.add(101, 3)
+    depth.add(105, 2)
+
+    assert depth.total == 10
+    assert depth.prefix(99) == 0
+    assert depth.prefix(100) == 5
+    assert depth.prefix(104) == 8
+    assert depth.prefix(10_000) == 10
+    assert depth.at_or_above(101) == 5
+    assert depth.at_or_above(106) == 0
+
+
+def test_growth_keeps_earlier_levels():
+    depth = DepthIndex()
+    depth.add(3, 4)
+    depth.add(1_000_000, 6)
+
+    assert depth.prefix(3) == 4
+    assert depth.prefix(999_999) == 4
+    assert depth.prefix(1_000_000) == 10
+
+
+def test_remove_level():
+    depth = DepthIndex()
+    depth.add(50, 7)
+    depth.add(60, 1)
+    depth.add(50, -7)
+
+    assert depth.prefix(59) == 0
+    assert depth.total == 1
+
+
+def test_negative_prices_rejected_before_reaching_the_book():
+    with pytest.raises(ValidationError):
+        CreateOrder(type=OrderType.CREATE, ts=1, seq=1, symbol=Symbol.ABC, side=OrderSide.BUY,
+                    order_id="B1", price=-1, qty=5)
+    with pytest.raises(ValidationError):
+        AmendOrder(type=OrderType.AMEND, ts=2, seq=2, symbol=Symbol.ABC, order_id="B1", price=-5)
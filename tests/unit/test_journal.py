@@ -0,0 +1,66 @@
+from common.utils.journal import TradeJournal, JournalReader, segment_paths, index_path, read_index
+
+
+def _trade(i: int, buy: str, sell: str, symbol: str = "ABC") -> dict:
+    return {"ts": 1000 + i, "seq": i, "symbol": symbol, "buy_order_id": buy, "sell_order_id": sell,
+            "qty": 1, "price": 100, "maker_order_id": sell, "taker_side": "B"}
+
+
+def test_rotation_writes_sidecar_indexes(tmp_path):
+    journal = TradeJournal(str(tmp_path), segment_max_bytes=300)
+    for i in range(6):
+        journal.write_json(_trade(i, buy=f"B{i}", sell="S1"))
+    journal.close()
+
+    segments = segment_paths(tmp_path, "trades")
+    assert len(segments) > 1
+    assert all(index_path(segment).exists() for segment in segments)
+
+
+def test_reader_finds_order_trades_across_segments(tmp_path):
+    journal = TradeJournal(str(tmp_path), segment_max_bytes=300)
+    for i in range(6):
+        journal.write_json(_trade(i, buy=f"B{i}", sell="S1"))
+    journal.write_json(_trade(6, buy="B0", sell="S9", symbol="XYZ"))
+
+    # the active segment is not sealed yet and gets indexed by a scan
+    reader = JournalReader(str(tmp_path))
+    assert [t["seq"] for t in reader.trades_for_order("S1")] == [0, 1, 2, 3, 4, 5]
+    assert [t["seq"] for t in reader.trades_for_order("B0")] == [0, 6]
+    assert [t["seq"] for t in reader.trades_for_order("B0", symbol="XYZ")] == [6]
+    assert reader.trades_for_order("missing") == []
+
+    assert [t["ts"] for t in reader.trades_between(1002, 1004)] == [1002, 1003, 1004]
+    journal.close()
+
+
+def test_reopen_continues_numbering_and_recovers_unsealed(tmp_path):
+    journal = TradeJournal(str(tmp_path))
+    journal.write_json(_trade(0, buy="B0", sell="S0"))
+    journal.file.close()  # simulate a crash, no sidecar written
+
+    journal = TradeJournal(str(tmp_path))
+    journal.write_json(_trade(1, buy="B1", sell="S1"))
+    journal.close()
+
+    segments = segment_paths(tmp_path, "trades")
+    assert [s.name for s in segments] == ["trades-000001.ndjson", "trades-000002.ndjson"]
+    assert all(index_path(segment).exists() for segment in segments)
+    assert len(JournalReader(str(tmp_path)).trades_for_order("B0")) == 1
+
+
+def test_torn_sidecar_is_rebuilt(tmp_path):
+    journal = TradeJournal(str(tmp_path), segment_max_bytes=300)
+    for i in range(6):
+        journal.write_json(_trade(i, buy=f"B{i}", sell="S1"))
+    journal.close()
+
+    # a crash while sealing used to leave a truncated sidecar
+    first = segment_paths(tmp_path, "trades")[0]
+    index_path(first).write_text('{"order_ids": {"B0": [0')
+
+    # readers fall back to a scan, reopening the journal rewrites the sidecar
+    assert [t["seq"] for t in JournalReader(str(tmp_path)).trades_for_order("S1")] == [0, 1, 2, 3, 4, 5]
+    TradeJournal(str(tmp_path), segment_max_bytes=300)
+    assert read_index(first).order_ids["B0"] == [0]
+    assert not list(tmp_path.glob("*.tmp"))
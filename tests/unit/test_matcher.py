@@ -1,7 +1,9 @@
 import pytest
+from loguru import logger
+
 from engine.core.matcher import Matcher
-from common.enums.order import Symbol, OrderSide, OrderType
-from common.models.orders import CreateOrder, AmendOrder
+from common.enums.order import Symbol, OrderSide, OrderType, OrderKind, TimeInForce, MatchingMode
+from common.models.orders import BaseOrder, CreateOrder, AmendOrder, MassQuoteOrder, MassCancelOrder, QuoteLevel
 
 
 @pytest.mark.asyncio
@@ -123,3 +125,279 @@ async def test_amend_qty_zero_behaves_as_cancel():
 
     book = matcher.books[Symbol.DEF]
     assert not book.is_active("S1")
+
+
+@pytest.mark.asyncio
+async def test_mass_quote_replaces_owner_ladder():
+    matcher = Matcher()
+
+    quote = MassQuoteOrder(
+        type=OrderType.MASS_QUOTE,
+        ts=1000,
+        seq=1,
+        symbol=Symbol.ABC,
+        order_id="Q1",
+        owner="MM1",
+        quotes=[
+            QuoteLevel(order_id="MM1-B1", side=OrderSide.BUY, price=99, qty=5),
+            QuoteLevel(order_id="MM1-S1", side=OrderSide.SELL, price=101, qty=5),
+        ]
+    )
+    await matcher.handle_event(quote)
+
+    refresh = MassQuoteOrder(
+        type=OrderType.MASS_QUOTE,
+        ts=1010,
+        seq=2,
+        symbol=Symbol.ABC,
+        order_id="Q2",
+        owner="MM1",
+        quotes=[
+            QuoteLevel(order_id="MM1-B2", side=OrderSide.BUY, price=100, qty=3),
+            QuoteLevel(order_id="MM1-S2", side=OrderSide.SELL, price=102, qty=3),
+        ]
+    )
+    trades = await matcher.handle_event(refresh)
+
+    assert trades == []
+    book = matcher.books[Symbol.ABC]
+    assert not book.is_active("MM1-B1")
+    assert not book.is_active("MM1-S1")
+    assert book.get_best_bid().order_id == "MM1-B2"
+    assert book.get_best_ask().order_id == "MM1-S2"
+    assert book.owners["MM1"] == {"MM1-B2", "MM1-S2"}
+
+
+@pytest.mark.asyncio
+async def test_mass_quote_leaves_owner_stops_pending():
+    matcher = Matcher()
+
+    await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1000, seq=1, symbol=Symbol.ABC,
+                                           side=OrderSide.BUY, order_id="STOP1", qty=2, owner="MM1",
+                                           kind=OrderKind.STOP, stop_price=110))
+    quote = MassQuoteOrder(type=OrderType.MASS_QUOTE, ts=1001, seq=2, symbol=Symbol.ABC, order_id="Q1",
+                           owner="MM1", quotes=[QuoteLevel(order_id="MM1-B1", side=OrderSide.BUY, price=99, qty=5)])
+    await matcher.handle_event(quote)
+
+    book = matcher.books[Symbol.ABC]
+    assert book.is_active("STOP1")
+    assert book.is_active("MM1-B1")
+
+    # an explicit mass cancel still takes the stops
+    await matcher.handle_event(MassCancelOrder(type=OrderType.MASS_CANCEL, ts=1002, seq=3, symbol=Symbol.ABC,
+                                               order_id="MC1", owner="MM1"))
+    assert not book.is_active("STOP1")
+    assert not book.is_active("MM1-B1")
+
+
+@pytest.mark.asyncio
+async def test_mass_cancel_by_owner():
+    matcher = Matcher()
+
+    await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1000, seq=1, symbol=Symbol.ABC,
+                                           side=OrderSide.BUY, order_id="B1", price=100, qty=5, owner="MM1"))
+    await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1001, seq=2, symbol=Symbol.ABC,
+                                           side=OrderSide.BUY, order_id="B2", price=100, qty=5, owner="MM2"))
+
+    cancel = MassCancelOrder(type=OrderType.MASS_CANCEL, ts=1002, seq=3, symbol=Symbol.ABC,
+                             order_id="MC1", owner="MM1")
+    await matcher.handle_event(cancel)
+
+    book = matcher.books[Symbol.ABC]
+    assert not book.is_active("B1")
+    assert book.is_active("B2")
+
+
+async def _rest_asks(matcher: Matcher):
+    await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1000, seq=1, symbol=Symbol.ABC,
+                                           side=OrderSide.SELL, order_id="S1", price=100, qty=4))
+    await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1001, seq=2, symbol=Symbol.ABC,
+                                           side=OrderSide.SELL, order_id="S2", price=102, qty=4))
+
+
+@pytest.mark.asyncio
+async def test_ioc_remainder_is_dropped():
+    matcher = Matcher()
+    await _rest_asks(matcher)
+
+    ioc = CreateOrder(type=OrderType.CREATE, ts=1010, seq=3, symbol=Symbol.ABC, side=OrderSide.BUY,
+                      order_id="B1", price=101, qty=10, tif=TimeInForce.IOC)
+    trades = await matcher.handle_event(ioc)
+
+    assert [t.qty for t in trades] == [4]
+    book = matcher.books[Symbol.ABC]
+    assert not book.is_active("B1")
+    assert book.get_best_ask().order_id == "S2"
+
+
+@pytest.mark.asyncio
+async def test_fok_rejected_when_not_fillable():
+    matcher = Matcher()
+    await _rest_asks(matcher)
+
+    fok = CreateOrder(type=OrderType.CREATE, ts=1010, seq=3, symbol=Symbol.ABC, side=OrderSide.BUY,
+                      order_id="B1", price=101, qty=5, tif=TimeInForce.FOK)
+    trades = await matcher.handle_event(fok)
+
+    assert trades == []
+    book = matcher.books[Symbol.ABC]
+    assert book.get_best_ask().qty == 4
+    assert not book.is_active("B1")
+
+
+@pytest.mark.asyncio
+async def test_fok_fills_across_levels():
+    matcher = Matcher()
+    await _rest_asks(matcher)
+
+    fok = CreateOrder(type=OrderType.CREATE, ts=1010, seq=3, symbol=Symbol.ABC, side=OrderSide.BUY,
+                      order_id="B1", price=102, qty=6, tif=TimeInForce.FOK)
+    trades = await matcher.handle_event(fok)
+
+    assert [(t.price, t.qty) for t in trades] == [(100, 4), (102, 2)]
+
+
+@pytest.mark.asyncio
+async def test_market_order_sweeps_and_never_rests():
+    matcher = Matcher()
+    await _rest_asks(matcher)
+
+    market = CreateOrder(type=OrderType.CREATE, ts=1010, seq=3, symbol=Symbol.ABC, side=OrderSide.BUY,
+                         order_id="B1", qty=10, kind=OrderKind.MARKET)
+    trades = await matcher.handle_event(market)
+
+    assert sum(t.qty for t in trades) == 8
+    book = matcher.books[Symbol.ABC]
+    assert book.get_best_ask() is None
+    assert book.get_best_bid() is None
+
+
+def test_limit_order_requires_price():
+    with pytest.raises(ValueError):
+        CreateOrder(type=OrderType.CREATE, ts=1000, seq=1, symbol=Symbol.ABC, side=OrderSide.BUY,
+                    order_id="B1", qty=1)
+
+
+@pytest.mark.asyncio
+async def test_stop_orders_trigger_and_cascade():
+    matcher = Matcher()
+
+    # resting liquidity on both sides
+    for i, (side, price, qty) in enumerate([(OrderSide.BUY, 99, 2), (OrderSide.BUY, 97, 5),
+                                            (OrderSide.SELL, 101, 5)], start=1):
+        await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1000 + i, seq=i, symbol=Symbol.ABC,
+                                               side=side, order_id=f"R{i}", price=price, qty=qty))
+
+    # sell stop at 99 sweeps down to 97, which fires the sell stop-limit at 97
+    stop = CreateOrder(type=OrderType.CREATE, ts=1010, seq=10, symbol=Symbol.ABC, side=OrderSide.SELL,
+                       order_id="ST1", qty=3, kind=OrderKind.STOP, stop_price=99)
+    stop_limit = CreateOrder(type=OrderType.CREATE, ts=1011, seq=11, symbol=Symbol.ABC, side=OrderSide.SELL,
+                             order_id="ST2", qty=4, price=96, kind=OrderKind.STOP_LIMIT, stop_price=97)
+    assert await matcher.handle_event(stop) == []
+    assert await matcher.handle_event(stop_limit) == []
+
+    book = matcher.books[Symbol.ABC]
+    assert book.is_active("ST1")
+    assert book.get_best_bid().order_id == "R1"
+
+    trigger = CreateOrder(type=OrderType.CREATE, ts=1020, seq=20, symbol=Symbol.ABC, side=OrderSide.SELL,
+                          order_id="S1", price=99, qty=1)
+    trades = await matcher.handle_event(trigger)
+
+    assert [(t.sell_order_id, t.price, t.qty) for t in trades] == [
+        ("S1", 99, 1),
+        ("ST1", 99, 1),
+        ("ST1", 97, 2),
+        ("ST2", 97, 3),
+    ]
+    assert book.last_price == 97
+    assert not book.stops.lookup
+
+    # stop-limit remainder rests at its limit price
+    assert book.get_best_ask().order_id == "ST2"
+    assert book.get_best_ask().qty == 1
+    assert book.get_best_ask().price == 96
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_stop():
+    matcher = Matcher()
+
+    stop = CreateOrder(type=OrderType.CREATE, ts=1000, seq=1, symbol=Symbol.ABC, side=OrderSide.BUY,
+                       order_id="ST1", qty=3, kind=OrderKind.STOP, stop_price=105)
+    await matcher.handle_event(stop)
+    await matcher.handle_event(BaseOrder(type=OrderType.CANCEL, ts=1001, seq=2, symbol=Symbol.ABC, order_id="ST1"))
+
+    assert not matcher.books[Symbol.ABC].is_active("ST1")
+
+
+@pytest.mark.asyncio
+async def test_auction_accumulates_then_uncrosses_at_equilibrium():
+    matcher = Matcher(modes={Symbol.ABC: MatchingMode.AUCTION})
+
+    flow = [
+        (OrderSide.BUY, "B1", 102, 5),
+        (OrderSide.BUY, "B2", 100, 5),
+        (OrderSide.SELL, "S1", 99, 4),
+        (OrderSide.SELL, "S2", 101, 4),
+        (OrderSide.SELL, "S3", 103, 4),
+    ]
+    for i, (side, order_id, price, qty) in enumerate(flow, start=1):
+        trades = await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1000 + i, seq=i, symbol=Symbol.ABC,
+                                                        side=side, order_id=order_id, price=price, qty=qty))
+        assert trades == []
+
+    # IOC cannot wait for the uncross
+    ioc = CreateOrder(type=OrderType.CREATE, ts=1010, seq=10, symbol=Symbol.ABC, side=OrderSide.BUY,
+                      order_id="B3", price=105, qty=1, tif=TimeInForce.IOC)
+    assert await matcher.handle_event(ioc) == []
+
+    book = matcher.books[Symbol.ABC]
+    assert book.equilibrium_price() == (101, 5)
+
+    trades = await matcher.uncross(Symbol.ABC)
+
+    assert {t.price for t in trades} == {101}
+    assert [(t.buy_order_id, t.sell_order_id, t.qty) for t in trades] == [("B1", "S1", 4), ("B1", "S2", 1)]
+    assert trades[0].maker_order_id == "B1"
+    assert trades[0].taker_side == OrderSide.SELL
+    assert book.get_best_bid().order_id == "B2"
+    assert book.get_best_ask().qty == 3
+    assert await matcher.uncross(Symbol.ABC) == []
+
+
+@pytest.mark.asyncio
+async def test_stop_fired_by_uncross_is_rejected_explicitly():
+    matcher = Matcher(modes={Symbol.ABC: MatchingMode.AUCTION})
+    flow = [
+        (OrderSide.BUY, "B1", 100, 2, OrderKind.LIMIT, None),
+        (OrderSide.BUY, "B2", 95, 5, OrderKind.LIMIT, None),
+        (OrderSide.SELL, "S1", 100, 2, OrderKind.LIMIT, None),
+        (OrderSide.SELL, "ST1", None, 3, OrderKind.STOP, 100),
+        (OrderSide.SELL, "ST2", 94, 1, OrderKind.STOP_LIMIT, 100),
+    ]
+    for i, (side, order_id, price, qty, kind, stop_price) in enumerate(flow, start=1):
+        await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1000 + i, seq=i, symbol=Symbol.ABC,
+                                               side=side, order_id=order_id, price=price, qty=qty, kind=kind,
+                                               stop_price=stop_price))
+
+    warnings = []
+    handler = logger.add(warnings.append, level="WARNING", format="{message}")
+    try:
+        trades = await matcher.uncross(Symbol.ABC)
+    finally:
+        logger.remove(handler)
+
+    # the uncross at 100 fires both stops: the stop-market cannot wait for the next auction and is
+    # rejected with a warning, the stop-limit rests for it
+    assert [(t.buy_order_id, t.sell_order_id, t.price) for t in trades] == [("B1", "S1", 100)]
+    book = matcher.books[Symbol.ABC]
+    assert not book.is_active("ST1")
+    assert any("ST1" in w for w in warnings)
+    assert book.get_best_ask().order_id == "ST2"
+    assert book.get_best_bid().order_id == "B2"
+
+
+def test_auction_symbols_from_modes():
+    matcher = Matcher(modes={Symbol.ABC: MatchingMode.AUCTION, Symbol.XYZ: MatchingMode.CONTINUOUS})
+    assert matcher.auction_symbols() == [Symbol.ABC]
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from common.enums.order import OrderType
+from common.models.orders import CreateOrder, MassCancelOrder
+from engine.core.decoder import build_order, decode_order, decode_row
+from engine.bench.decode import measure
+from common.utils import runtime
+from engine.core.pipeline import DecodePipeline
+
+
+def _msg(seq: int, **extra) -> SimpleNamespace:
+    data = {"type": "create", "ts": 1000 + seq, "seq": seq, "symbol": "ABC", "side": "B",
+            "order_id": f"B{seq}", "price": 100, "qty": 1, **extra}
+    return SimpleNamespace(data=json.dumps(data).encode())
+
+
+def test_decode_order_picks_model_by_type():
+    order = decode_order(_msg(1).data)
+    assert isinstance(order, CreateOrder)
+
+    data = json.dumps({"type": "mass_cancel", "ts": 1, "seq": 1, "symbol": "ABC", "order_id": "MC1", "owner": "MM1"})
+    assert isinstance(decode_order(data.encode()), MassCancelOrder)
+
+    assert decode_order(json.dumps({"type": "unknown"}).encode()) is None
+
+
+def test_row_round_trip_matches_validated_order():
+    messages = [
+        _msg(1, kind="stop_limit", stop_price=99, tif="IOC", owner="MM1").data,
+        json.dumps({"type": "amend", "ts": 2, "seq": 2, "symbol": "XYZ", "order_id": "B1", "qty": 3}).encode(),
+        json.dumps({"type": "cancel", "ts": 3, "seq": 3, "symbol": "DEF", "order_id": "B1"}).encode(),
+        json.dumps({"type": "mass_quote", "ts": 4, "seq": 4, "symbol": "ABC", "order_id": "Q1", "owner": "MM1",
+                    "quotes": [{"order_id": "Q1-S", "side": "S", "price": 101, "qty": 2}]}).encode(),
+    ]
+    for data in messages:
+        # rows cross the process boundary pickled
+        row = pickle.loads(pickle.dumps(decode_row(data)))
+
+        order, expected = build_order(row), decode_order(data)
+        assert type(order) is type(expected) and order == expected
+        assert order.symbol.value == expected.symbol.value
+
+
+@pytest.mark.asyncio
+async def test_pipeline_hands_off_in_arrival_order():
+    received = []
+
+    async def sink(msg, order):
+        received.append(order.seq)
+
+    # earlier messages decode slower, so workers finish out of order
+    def slow_decode(data: bytes):
+        row = decode_row(data)
+        time.sleep(0.002 * (10 - json.loads(data)["seq"]))
+        return row
+
+    pipeline = DecodePipeline(sink=sink, workers=4, executor=ThreadPoolExecutor(max_workers=4), decode=slow_decode)
+    pipeline.start()
+
+    for seq in range(1, 10):
+        await pipeline.submit(_msg(seq))
+    await pipeline.close()
+
+    assert received == list(range(1, 10))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_bad_messages():
+    received = []
+
+    async def sink(msg, order):
+        received.append(order.type)
+
+    pipeline = DecodePipeline(sink=sink, workers=2, executor=ThreadPoolExecutor(max_workers=2))
+    pipeline.start()
+
+    await pipeline.submit(SimpleNamespace(data=b"not json"))
+    await pipeline.submit(_msg(1, price="abc"))
+    await pipeline.submit(_msg(2))
+    await pipeline.close()
+
+    assert received == [OrderType.CREATE]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_back_pressure_and_batching():
+    release = asyncio.Event()
+    received = []
+    batches = []
+
+    async def sink(msg, order):
+        await release.wait()
+        received.append(order.seq)
+
+    class _Executor(ThreadPoolExecutor):
+        def submit(self, fn, decode, batch):
+            batches.append(len(batch))
+            return super().submit(fn, decode, batch)
+
+    pipeline = DecodePipeline(sink=sink, workers=1, max_in_flight=4, batch_size=3, executor=_Executor(1))
+    pipeline.start()
+
+    for seq in range(1, 5):
+        await pipeline.submit(_msg(seq))
+    # a fifth message waits for the matcher to take some
+    blocked = asyncio.create_task(pipeline.submit(_msg(5)))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    release.set()
+    await blocked
+    await pipeline.close()
+    assert received == [1, 2, 3, 4, 5]
+    assert batches == [3, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_worker_log_lines_reach_stderr(capfd):
+    received = []
+
+    async def sink(msg, order):
+        received.append(order.seq)
+
+    # the queued sink of the engine process must not swallow what workers log
+    runtime.configure_logging("INFO", enqueue=True)
+    try:
+        pipeline = DecodePipeline(sink=sink, workers=1)
+        pipeline.start()
+        await pipeline.submit(SimpleNamespace(data=b'{"type": "bogus"}'))
+        await pipeline.submit(_msg(1))
+        await pipeline.close()
+    finally:
+        runtime.configure_logging("INFO", enqueue=False)
+
+    assert received == [1]
+    assert "Unexpected type is detected" in capfd.readouterr().err
+
+
+def test_decode_bench_reports_both_modes():
+    results = asyncio.run(measure(200, workers=[1]))
+    assert set(results) == {"inline", "workers=1"}
+    assert all(r["msgs_per_s"] > 0 for r in results.values())
@@ -0,0 +1,92 @@
+import json
+import time
+
+import pytest
+
+from engine.profiler import SamplingProfiler
+
+
+def _busy_loop(seconds: float) -> int:
+    total, deadline = 0, time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def test_profile_samples_running_thread(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), interval_ms=1)
+    path = profiler.start(0.2)
+
+    # the profiled thread keeps running while samples are taken
+    assert path is not None and profiler.active
+    assert profiler.start(1) is None
+    _busy_loop(0.3)
+    profiler.thread.join()
+
+    lines = path.read_text().splitlines()
+    assert lines
+    stacks = {}
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        stacks[stack] = int(count)
+    assert any("test_profiler:_busy_loop" in stack.split(";")[-1] for stack in stacks)
+    assert sum(stacks.values()) > 10
+
+
+class _Msg:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.reply = "inbox"
+        self.response = None
+
+    async def respond(self, data: bytes) -> None:
+        self.response = json.loads(data)
+
+
+@pytest.mark.asyncio
+async def test_control_request(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), interval_ms=1)
+
+    msg = _Msg(b'{"duration_s": 0.05}')
+    await profiler.on_request(msg)
+    assert msg.response["started"] and msg.response["path"].startswith(str(tmp_path))
+
+    busy = _Msg(b"")
+    await profiler.on_request(busy)
+    assert busy.response == {"started": False, "path": None}
+
+    bad = _Msg(b"not json")
+    profiler.thread.join()
+    await profiler.on_request(bad)
+    assert not bad.response["started"] and "error" in bad.response
+
+
+@pytest.mark.asyncio
+async def test_control_request_validates_duration(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), interval_ms=1, max_duration_s=60)
+
+    for body in (b'{"duration_s": "5"}', b'{"duration_s": -1}', b'{"duration_s": 0}', b'{"duration_s": 1e9}',
+                 b'{"duration_s": true}'):
+        msg = _Msg(body)
+        await profiler.on_request(msg)
+        assert not msg.response["started"] and "duration_s" in msg.response["error"]
+    assert profiler.thread is None
+
+    with pytest.raises(ValueError):
+        SamplingProfiler(str(tmp_path), default_duration_s=120, max_duration_s=60)
+
+
+@pytest.mark.asyncio
+async def test_running_profile_can_be_stopped(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), interval_ms=1)
+    path = profiler.start(60)
+
+    stop = _Msg(b'{"action": "stop"}')
+    await profiler.on_request(stop)
+    assert stop.response == {"stopped": True}
+    profiler.thread.join(timeout=5)
+    assert not profiler.active and path.exists()
+
+    idle = _Msg(b'{"action": "stop"}')
+    await profiler.on_request(idle)
+    assert idle.response == {"stopped": False}
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from pusher.parallel import assign_streams, publish_parallel, split_by_symbol
+
+
+class _Broker:
+    def __init__(self, name: str, sent: list):
+        self.name = name
+        self.sent = sent
+
+    async def publish(self, subject, message, headers=None):
+        # yield so streams on the other connections interleave
+        await asyncio.sleep(0)
+        self.sent.append((self.name, message))
+
+
+def _orders():
+    flow = ["ABC"] * 6 + ["XYZ"] * 3 + ["DEF"] * 2 + ["ABC", "XYZ"]
+    return [{"symbol": symbol, "order_id": f"{symbol}{i}", "seq": i} for i, symbol in enumerate(flow)]
+
+
+def test_split_and_assign():
+    streams = split_by_symbol(_orders())
+    assert [o["seq"] for o in streams["ABC"]] == [0, 1, 2, 3, 4, 5, 11]
+
+    # largest stream alone, the rest share the least loaded connection
+    assert assign_streams(streams, 2) == [["ABC"], ["XYZ", "DEF"]]
+    assert assign_streams(streams, 8) == [["ABC"], ["XYZ"], ["DEF"], [], [], [], [], []]
+
+
+@pytest.mark.asyncio
+async def test_publish_parallel_keeps_symbol_order():
+    sent = []
+    brokers = [_Broker("c1", sent), _Broker("c2", sent)]
+    stats = await publish_parallel(brokers, _orders(), subject="orders.in", delay=0)
+
+    assert len(sent) == 13
+    # streams interleave across symbols
+    assert [m["symbol"] for _, m in sent[:2]] != ["ABC", "ABC"]
+
+    for symbol, stream in split_by_symbol(_orders()).items():
+        published = [(conn, m) for conn, m in sent if m["symbol"] == symbol]
+        assert [m for _, m in published] == stream
+        assert len({conn for conn, _ in published}) == 1
+
+    assert stats.counts == {"ABC": 7, "XYZ": 4, "DEF": 2}
+    assert stats.errors == 0
+    assert set(stats.rates()) == {"all", "ABC", "XYZ", "DEF"}
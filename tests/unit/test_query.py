@@ -0,0 +1,158 @@
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from common.enums.order import Symbol, OrderSide, OrderType, OrderKind
+from common.enums.query import QueryType, OrderStatusType
+from common.models.orders import BaseOrder, CreateOrder, AmendOrder, MassCancelOrder
+from common.models.query import BookQuery, QueryError
+from engine.core.matcher import Matcher
+from engine.core.query import QueryService
+from engine.core.snapshot import BookSnapshot
+
+
+async def _filled_matcher() -> Matcher:
+    matcher = Matcher()
+    flow = [(OrderSide.BUY, "B1", 100, 5), (OrderSide.BUY, "B2", 100, 3), (OrderSide.BUY, "B3", 99, 1),
+            (OrderSide.SELL, "S1", 101, 4), (OrderSide.SELL, "S2", 103, 2)]
+    for i, (side, order_id, price, qty) in enumerate(flow, start=1):
+        await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1000 + i, seq=i, symbol=Symbol.ABC,
+                                               side=side, order_id=order_id, price=price, qty=qty))
+    await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1010, seq=10, symbol=Symbol.ABC,
+                                           side=OrderSide.BUY, order_id="ST1", qty=1, kind=OrderKind.STOP,
+                                           stop_price=110))
+    return matcher
+
+
+@pytest.mark.asyncio
+async def test_queries_served_from_snapshot():
+    matcher = await _filled_matcher()
+    service = QueryService(matcher, broker=None, subject="book.query")
+    service.refresh()
+
+    bbo = service.answer(BookQuery(type=QueryType.BBO, symbol=Symbol.ABC))
+    assert (bbo.bid_price, bbo.bid_qty, bbo.ask_price, bbo.ask_qty) == (100, 8, 101, 4)
+
+    depth = service.answer(BookQuery(type=QueryType.DEPTH, symbol=Symbol.ABC, levels=1))
+    assert [(l.price, l.qty, l.orders) for l in depth.bids] == [(100, 8, 2)]
+    assert [(l.price, l.qty) for l in depth.asks] == [(101, 4)]
+
+    status = service.answer(BookQuery(type=QueryType.ORDER_STATUS, symbol=Symbol.ABC, order_id="ST1"))
+    assert status.status == OrderStatusType.PENDING_STOP
+
+    missing = service.answer(BookQuery(type=QueryType.ORDER_STATUS, symbol=Symbol.ABC, order_id="X"))
+    assert missing.status == OrderStatusType.NOT_FOUND
+
+    assert isinstance(service.answer(BookQuery(type=QueryType.BBO, symbol=Symbol.XYZ)), QueryError)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_stale_until_refresh():
+    matcher = await _filled_matcher()
+    service = QueryService(matcher, broker=None, subject="book.query")
+    service.refresh()
+    first = service.snapshots[Symbol.ABC]
+
+    # unchanged book keeps its snapshot
+    service.refresh()
+    assert service.snapshots[Symbol.ABC] is first
+
+    await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=1020, seq=20, symbol=Symbol.ABC,
+                                           side=OrderSide.SELL, order_id="S3", price=100, qty=8))
+    query = BookQuery(type=QueryType.ORDER_STATUS, symbol=Symbol.ABC, order_id="B1")
+    assert service.answer(query).status == OrderStatusType.RESTING
+
+    service.refresh()
+    assert service.answer(query).status == OrderStatusType.NOT_FOUND
+
+
+def test_depth_levels_must_be_positive():
+    with pytest.raises(ValidationError):
+        BookQuery(type=QueryType.DEPTH, symbol=Symbol.ABC, levels=-1)
+    with pytest.raises(ValidationError):
+        BookQuery(type=QueryType.DEPTH, symbol=Symbol.ABC, levels=0)
+
+
+@pytest.mark.asyncio
+async def test_synced_snapshot_matches_fresh_capture():
+    matcher = Matcher(cold_distance=3)
+    service = QueryService(matcher, broker=None, subject="book.query")
+    seq = 0
+
+    def create(side, order_id, price, qty, owner="MM1", **kwargs):
+        nonlocal seq
+        seq += 1
+        return CreateOrder(type=OrderType.CREATE, ts=1000 + seq, seq=seq, symbol=Symbol.ABC, side=side,
+                           order_id=order_id, price=price, qty=qty, owner=owner, **kwargs)
+
+    # far levels land in the cold tier, the stop sits pending
+    for i in range(20):
+        await matcher.handle_event(create(OrderSide.BUY, f"B{i}", 100 - i, 1 + i % 3))
+        await matcher.handle_event(create(OrderSide.SELL, f"S{i}", 101 + i, 1 + i % 4, owner="MM2"))
+    await matcher.handle_event(create(OrderSide.BUY, "ST1", None, 2, kind=OrderKind.STOP, stop_price=104))
+    service.refresh()
+
+    def assert_in_sync():
+        service.refresh()
+        synced = service.snapshots[Symbol.ABC]
+        fresh = BookSnapshot.capture(matcher.books[Symbol.ABC])
+        assert synced.version == fresh.version
+        assert dict(synced.bids) == dict(fresh.bids)
+        assert dict(synced.asks) == dict(fresh.asks)
+        assert synced.orders == fresh.orders
+
+    # partial fill, a sweep that fires the stop, an amend into a packed level
+    await matcher.handle_event(create(OrderSide.SELL, "T1", 100, 1, owner="T"))
+    assert_in_sync()
+    await matcher.handle_event(create(OrderSide.BUY, "T2", 104, 12, owner="T"))
+    assert_in_sync()
+    await matcher.handle_event(AmendOrder(type=OrderType.AMEND, ts=2000, seq=500, symbol=Symbol.ABC,
+                                          order_id="B2", price=90))
+    assert_in_sync()
+    await matcher.handle_event(BaseOrder(type=OrderType.CANCEL, ts=2001, seq=501, symbol=Symbol.ABC,
+                                         order_id="B15"))
+    assert_in_sync()
+
+    # owner scoped and whole side mass cancels
+    await matcher.handle_event(MassCancelOrder(type=OrderType.MASS_CANCEL, ts=2002, seq=502, symbol=Symbol.ABC,
+                                               order_id="MC1", owner="MM2"))
+    assert_in_sync()
+    await matcher.handle_event(MassCancelOrder(type=OrderType.MASS_CANCEL, ts=2003, seq=503, symbol=Symbol.ABC,
+                                               order_id="MC2", side=OrderSide.BUY))
+    assert_in_sync()
+    assert not service.snapshots[Symbol.ABC].bids
+
+
+@pytest.mark.asyncio
+async def test_refresh_cost_follows_changes_not_book_size():
+    matcher = Matcher()
+    book = matcher._get_book(Symbol.ABC)
+    orders = 50_000
+    for seq in range(orders):
+        side = OrderSide.BUY if seq % 2 else OrderSide.SELL
+        price = 10_000 - seq % 5_000 if side == OrderSide.BUY else 10_001 + seq % 5_000
+        book.add_order(CreateOrder(type=OrderType.CREATE, ts=seq, seq=seq, symbol=Symbol.ABC, side=side,
+                                   order_id=f"O{seq}", price=price, qty=1))
+
+    service = QueryService(matcher, broker=None, subject="book.query")
+    started = time.perf_counter()
+    service.refresh()
+    capture = time.perf_counter() - started
+    assert len(service.snapshots[Symbol.ABC].orders) == orders
+
+    # one interval of flow on the deep book
+    for seq in range(orders, orders + 100):
+        await matcher.handle_event(CreateOrder(type=OrderType.CREATE, ts=seq, seq=seq, symbol=Symbol.ABC,
+                                               side=OrderSide.SELL, order_id=f"T{seq}", price=9_990, qty=1))
+
+    started = time.perf_counter()
+    service.refresh()
+    refresh = time.perf_counter() - started
+
+    snapshot = service.snapshots[Symbol.ABC]
+    assert snapshot.version == book.version
+    assert snapshot.best(OrderSide.BUY)[0] == book.get_best_bid().price
+    # bounded by the changes: well under the full capture and a few ms in absolute terms
+    assert refresh < 0.02
+    assert refresh < capture / 20
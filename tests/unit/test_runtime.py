@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+import pytest
+
+from common.enums.runtime import EventLoop, OverflowPolicy
+from common.utils import runtime
+from common.utils.file_manager import FileManager
+
+
+class _SlowSink:
+    def __init__(self):
+        self.release = threading.Event()
+        self.records = []
+        self.closed = False
+        self.threads = set()
+
+    def write_json(self, data, append=True):
+        self.release.wait(5)
+        self.threads.add(threading.current_thread().name)
+        self.records.append(data)
+
+    def close(self):
+        self.closed = True
+
+
+def test_log_sampler():
+    every_third = runtime.LogSampler(3)
+    assert [every_third() for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert all(runtime.LogSampler(1)() for _ in range(3))
+    assert not runtime.LogSampler(0)()
+
+
+def test_offload_writer_hands_off_and_keeps_order():
+    sink = _SlowSink()
+    writer = runtime.OffloadWriter(sink)
+
+    # returns while the sink is still blocked
+    for i in range(100):
+        writer.write_json({"seq": i})
+    assert sink.records == []
+
+    sink.release.set()
+    writer.close()
+    assert sink.records == [{"seq": i} for i in range(100)]
+    assert sink.closed
+    assert sink.threads != {threading.current_thread().name}
+
+
+def test_offload_writer_overflow_policy():
+    # drop: a full queue discards and counts instead of waiting
+    sink = _SlowSink()
+    writer = runtime.OffloadWriter(sink, max_pending=2, overflow=OverflowPolicy.DROP)
+    for i in range(10):
+        writer.write_json({"seq": i})
+    assert writer.dropped >= 7
+
+    sink.release.set()
+    writer.close()
+    assert len(sink.records) == 10 - writer.dropped
+    assert sink.records[0] == {"seq": 0}
+
+    # block: every record is kept, the caller waits for room
+    sink = _SlowSink()
+    writer = runtime.OffloadWriter(sink, max_pending=2, overflow=OverflowPolicy.BLOCK)
+    releaser = threading.Timer(0.1, sink.release.set)
+    releaser.start()
+    for i in range(10):
+        writer.write_json({"seq": i})
+    writer.close()
+    assert sink.records == [{"seq": i} for i in range(10)]
+
+
+class _SlowStream:
+    def __init__(self):
+        self.release = threading.Event()
+        self.lines = []
+
+    def write(self, line):
+        self.release.wait(5)
+        self.lines.append(line)
+
+    def flush(self):
+        pass
+
+
+def test_queue_sink_never_blocks_the_caller():
+    stream = _SlowStream()
+    sink = runtime.QueueSink(stream, maxsize=5)
+
+    # the stream is stuck, the caller still returns and overflow is counted
+    for i in range(50):
+        sink(f"line {i}\n")
+    assert sink.dropped >= 44
+
+    stream.release.set()
+    sink.stop()
+    written = [line for line in stream.lines if line.startswith("line")]
+    assert written[0] == "line 0\n" and len(written) == 50 - sink.dropped
+    assert f"[{sink.dropped} log lines dropped, stream too slow]\n" in stream.lines
+
+
+def test_offload_writer_with_file_manager(tmp_path):
+    writer = runtime.OffloadWriter(FileManager(str(tmp_path / "trades.ndjson")))
+    for i in range(10):
+        writer.write_json({"seq": i})
+    writer.close()
+    assert [r["seq"] for r in FileManager(str(tmp_path / "trades.ndjson")).read_json()] == list(range(10))
+
+
+def test_run_on_configured_loop():
+    async def loop_module():
+        return type(asyncio.get_running_loop()).__module__
+
+    assert runtime.run(loop_module(), EventLoop.ASYNCIO).startswith("asyncio")
+    assert runtime.run(loop_module(), EventLoop.AUTO)
+
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        with pytest.raises(RuntimeError):
+            runtime.loop_factory(EventLoop.UVLOOP)
+    else:
+        assert runtime.run(loop_module(), EventLoop.UVLOOP).startswith("uvloop")
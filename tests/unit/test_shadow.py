@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from common.enums.order import OrderSide, OrderType, Symbol
+from common.models.orders import BaseOrder, CreateOrder
+from engine.core.booker import OrderBook
+from engine.core.matcher import Matcher
+from engine.core.shadow import ShadowMatcher, load_book_class
+from engine.replay import replay
+
+
+class LifoBook(OrderBook):
+    """Broken backend: newest order first within a level."""
+    def get_best_ask(self):
+        best = super().get_best_ask()
+        return self.asks[best.price][-1] if best else None
+
+
+class FailingBook(OrderBook):
+    def cancel_order(self, order_id: str):
+        raise RuntimeError("not implemented")
+
+
+def _create(seq: int, side: OrderSide, price: int, qty: int = 5) -> CreateOrder:
+    return CreateOrder(type=OrderType.CREATE, ts=1000 + seq, seq=seq, symbol=Symbol.ABC, side=side,
+                       order_id=f"O{seq}", price=price, qty=qty)
+
+
+def _shadow(book_class: str, cold_distance=None) -> ShadowMatcher:
+    return ShadowMatcher(Matcher(cold_distance=cold_distance, book_factory=load_book_class(book_class)))
+
+
+@pytest.mark.asyncio
+async def test_equivalent_backend_never_diverges():
+    matcher = _shadow("engine.core.booker:OrderBook", cold_distance=3)
+    rng = random.Random(11)
+    for seq in range(1, 2001):
+        if rng.random() < 0.2:
+            await matcher.handle_event(BaseOrder(type=OrderType.CANCEL, ts=1000 + seq, seq=seq, symbol=Symbol.ABC,
+                                                 order_id=f"O{rng.randrange(1, seq)}"))
+        else:
+            side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+            await matcher.handle_event(_create(seq, side, rng.randint(90, 110), rng.randint(1, 10)))
+
+    assert matcher.divergence is None
+    assert matcher.events == 2000
+
+
+@pytest.mark.asyncio
+async def test_first_divergence_reported_with_context():
+    matcher = _shadow("tests.unit.test_shadow:LifoBook")
+    await matcher.handle_event(_create(1, OrderSide.SELL, 100))
+    await matcher.handle_event(_create(2, OrderSide.SELL, 100))
+    trades = await matcher.handle_event(_create(3, OrderSide.BUY, 100, qty=3))
+
+    # the wrong top of book is caught before any trade goes wrong
+    divergence = matcher.divergence
+    assert divergence.index == 2
+    assert divergence.primary_trades == divergence.candidate_trades == []
+    assert divergence.primary_top[1] == (100, "O1", 5)
+    assert divergence.candidate_top[1] == (100, "O2", 5)
+    assert len(divergence.recent) == 2
+    assert "diverged at event #2" in divergence.describe()
+
+    # primary stays authoritative
+    assert trades[0].sell_order_id == "O1"
+
+    # candidate is dropped after the first divergence
+    await matcher.handle_event(_create(4, OrderSide.BUY, 100, qty=3))
+    assert matcher.candidate is None and matcher.divergence is divergence
+
+
+@pytest.mark.asyncio
+async def test_candidate_error_is_a_divergence():
+    matcher = _shadow("tests.unit.test_shadow:FailingBook")
+    await matcher.handle_event(_create(1, OrderSide.SELL, 100))
+    await matcher.handle_event(BaseOrder(type=OrderType.CANCEL, ts=1002, seq=2, symbol=Symbol.ABC, order_id="O1"))
+
+    assert "RuntimeError: not implemented" in matcher.divergence.error
+    assert matcher.divergence.primary_top == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_replay_file(tmp_path):
+    path = tmp_path / "orders.ndjson"
+    path.write_text("\n".join(_create(seq, OrderSide.SELL if seq % 2 else OrderSide.BUY, 100).model_dump_json()
+                              for seq in range(1, 11)))
+
+    assert await replay(str(path), _shadow("engine.core.booker:OrderBook")) == 10
+    with pytest.raises(ValueError):
+        load_book_class("engine.core.booker.OrderBook")
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from common.enums.order import OrderSide, Symbol, OrderType
+from common.models.orders import AmendOrder, BaseOrder, CreateOrder
+from engine.core.booker import OrderBook
+from engine.core.matcher import Matcher
+
+
+def _bid(order_id: str, price: int, seq: int, qty: int = 5, owner: str | None = None) -> CreateOrder:
+    return CreateOrder(type=OrderType.CREATE, ts=1000 + seq, seq=seq, symbol=Symbol.ABC, side=OrderSide.BUY,
+                       order_id=order_id, price=price, qty=qty, owner=owner)
+
+
+def test_far_levels_are_packed_and_promoted():
+    book = OrderBook(Symbol.ABC, cold_distance=2)
+    book.add_order(_bid("B1", 100, seq=1))
+    book.add_order(_bid("B2", 99, seq=2))
+    book.add_order(_bid("B3", 95, seq=3))
+    book.add_order(_bid("B4", 95, seq=4))
+
+    assert list(book.bids) == [99, 100]
+    assert list(book.cold_bids.levels) == [95]
+    assert book.is_active("B3") and "B3" not in book.lookup
+    assert book.fillable_qty(OrderSide.SELL, 95) == 20
+
+    # touch moves toward the packed level
+    book.cancel_order("B1")
+    book.cancel_order("B2")
+    assert book.get_best_bid().order_id == "B3"
+    assert [o.order_id for o in book.bids[95]] == ["B3", "B4"]
+    assert not book.cold_bids.levels
+
+
+def test_levels_left_behind_are_packed_again():
+    book = OrderBook(Symbol.ABC, cold_distance=2)
+    book.add_order(_bid("B1", 100, seq=1))
+    book.add_order(_bid("B2", 105, seq=2))
+
+    assert list(book.bids) == [105]
+    assert list(book.cold_bids.levels) == [100]
+
+
+def test_cancel_amend_and_mass_cancel_of_packed_orders():
+    book = OrderBook(Symbol.ABC, cold_distance=2)
+    book.add_order(_bid("B1", 100, seq=1))
+    book.add_order(_bid("B2", 90, seq=2, owner="MM1"))
+    book.add_order(_bid("B3", 80, seq=3, owner="MM1"))
+    book.add_order(_bid("B4", 80, seq=4))
+
+    book.cancel_order("B4")
+    assert not book.is_active("B4")
+    assert book.fillable_qty(OrderSide.SELL, 0) == 15
+
+    amend = AmendOrder(type=OrderType.AMEND, ts=1010, seq=10, symbol=Symbol.ABC, order_id="B2", qty=2)
+    assert book.amend_order(amend).qty == 2
+    assert book.fillable_qty(OrderSide.SELL, 0) == 12
+
+    assert sorted(book.mass_cancel(owner="MM1")) == ["B2", "B3"]
+    assert book.fillable_qty(OrderSide.SELL, 0) == 5
+    assert "MM1" not in book.owners
+
+
+@pytest.mark.asyncio
+async def test_tiered_book_matches_like_plain_book():
+    rng = random.Random(7)
+    plain = Matcher()
+    tiered = Matcher(cold_distance=3)
+
+    for seq in range(1, 2000):
+        roll = rng.random()
+        if seq > 10 and roll < 0.15:
+            order = BaseOrder(type=OrderType.CANCEL, ts=seq, seq=seq, symbol=Symbol.ABC,
+                              order_id=f"O{rng.randrange(1, seq)}")
+        elif seq > 10 and roll < 0.25:
+            order = AmendOrder(type=OrderType.AMEND, ts=seq, seq=seq, symbol=Symbol.ABC,
+                               order_id=f"O{rng.randrange(1, seq)}", price=100 + rng.randint(-15, 15),
+                               qty=rng.randint(1, 10))
+        else:
+            order = CreateOrder(type=OrderType.CREATE, ts=seq, seq=seq, symbol=Symbol.ABC,
+                                side=rng.choice([OrderSide.BUY, OrderSide.SELL]), order_id=f"O{seq}",
+                                price=100 + rng.randint(-15, 15), qty=rng.randint(1, 10))
+
+        expected = await plain.handle_event(order.model_copy(deep=True))
+        actual = await tiered.handle_event(order.model_copy(deep=True))
+        assert [t.model_dump() for t in actual] == [t.model_dump() for t in expected]
+
+    assert tiered.books[Symbol.ABC].cold_bids.levels or tiered.books[Symbol.ABC].cold_asks.levels
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from common.utils import tracing
+
+
+def test_stage_latencies_from_stamps():
+    headers = {
+        tracing.TRACE_PUBLISH: "1000",
+        tracing.TRACE_RECEIVE: "1500",
+        tracing.TRACE_MATCH: "1700",
+        tracing.TRACE_TRADE_PUBLISH: "2000",
+    }
+
+    stages = tracing.stage_latencies(headers, received_ns=2600)
+
+    assert stages == {"nats_in": 500, "decode_match": 200, "trade_io": 300, "nats_out": 600, "round_trip": 1600}
+
+
+def test_only_published_messages_are_traced():
+    plain = SimpleNamespace(headers=None)
+    tracing.mark_received(plain)
+    assert tracing.trace_context(plain) is None
+
+    traced = SimpleNamespace(headers=tracing.publish_headers())
+    tracing.mark_received(traced)
+    context = tracing.trace_context(traced)
+    assert set(context) == {tracing.TRACE_PUBLISH, tracing.TRACE_RECEIVE}
+
+
+def test_latency_recorder_percentiles():
+    recorder = tracing.LatencyRecorder(quantiles=(50, 99))
+    for value in range(1, 101):
+        recorder.record({"round_trip": value * 1000})
+
+    summary = recorder.summary()["round_trip"]
+    assert summary["p50"] == 50
+    assert summary["p99"] == 99
+    assert summary["max"] == 100
+    assert summary["count"] == 100
@@ -0,0 +1,50 @@
+from common.enums.order import OrderSide, Symbol, OrderType, OrderKind
+from common.models.orders import CreateOrder
+from engine.core.triggers import TriggerIndex
+
+
+def _stop(order_id: str, side: OrderSide, stop_price: int, seq: int, owner: str | None = None) -> CreateOrder:
+    return CreateOrder(type=OrderType.CREATE, ts=1000 + seq, seq=seq, symbol=Symbol.ABC, side=side,
+                       order_id=order_id, qty=1, kind=OrderKind.STOP, stop_price=stop_price, owner=owner)
+
+
+def test_pop_triggered_only_fired_stops():
+    index = TriggerIndex()
+    index.add(_stop("B1", OrderSide.BUY, 105, seq=1))
+    index.add(_stop("B2", OrderSide.BUY, 110, seq=2))
+    index.add(_stop("S1", OrderSide.SELL, 95, seq=3))
+    index.add(_stop("S2", OrderSide.SELL, 90, seq=4))
+
+    fired = index.pop_triggered(low=95, high=106)
+
+    assert [o.order_id for o in fired] == ["B1", "S1"]
+    assert "B2" in index and "S2" in index
+    assert len(index) == 2
+
+
+def test_cancel_pending_stop():
+    index = TriggerIndex()
+    index.add(_stop("B1", OrderSide.BUY, 105, seq=1))
+
+    assert index.cancel("B1").order_id == "B1"
+    assert not index.buy_stops
+    assert index.pop_triggered(low=0, high=1000) == []
+
+
+def test_cancel_where_uses_owner_index():
+    index = TriggerIndex()
+    index.add(_stop("B1", OrderSide.BUY, 105, seq=1, owner="mm1"))
+    index.add(_stop("S1", OrderSide.SELL, 95, seq=2, owner="mm1"))
+    index.add(_stop("B2", OrderSide.BUY, 110, seq=3, owner="mm2"))
+    index.add(_stop("S2", OrderSide.SELL, 90, seq=4))
+
+    assert index.cancel_where(side=OrderSide.BUY, owner="mm1") == ["B1"]
+    assert index.owners == {"mm1": {"S1"}, "mm2": {"B2"}}
+
+    # fired stops leave the owner index too
+    index.pop_triggered(low=95, high=95)
+    assert index.owners == {"mm2": {"B2"}}
+
+    assert index.cancel_where(side=OrderSide.SELL) == ["S2"]
+    assert index.cancel_where(owner="mm2") == ["B2"]
+    assert not index.owners and len(index) == 0